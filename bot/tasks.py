@@ -1,43 +1,216 @@
 import os
+import re
 import json
+import functools
 import time
 import logging
 import threading
+import queue
+import signal
 import subprocess
 import tempfile
+import pathlib
+from array import array
 import cv2
+import numpy as np
 import speech_recognition as sr
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from deepface import DeepFace
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
 from urllib.parse import urlparse
+from django.conf import settings
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+try:
+    import sounddevice as sd
+except ImportError:
+    sd = None
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+try:
+    from google.cloud import speech as gcloud_speech
+except ImportError:
+    gcloud_speech = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Participant count shown on the People button, e.g. "People (3)"
+_COUNT_RE = re.compile(r'\(?(\d+)\)?')
+# DirectShow device listing line, e.g. '"Microphone (Realtek Audio)" (audio)'
+_AUDIO_DEVICE_RE = re.compile(rb'"([^"]+)"\s*\(audio\)')
+# FFmpeg failing to open a dshow audio input (as opposed to the 'Input #1, dshow' header it always prints)
+_DSHOW_OPEN_ERROR_RE = re.compile(r"Could not find audio only device|Error opening input[^\n]*audio=|audio=[^\n]*: I/O error")
+# Report summary: candidate topic words and sentences that read like action items
+_TOPIC_WORD_RE = re.compile(r'[a-z]{5,}')
+_ACTION_ITEM_RE = re.compile(r'[^.]*\b(?:action|todo|task|follow up|next steps)\b[^.]*', re.I)
+# Common 5+ letter filler words that would otherwise crowd out real topics
+_TOPIC_STOPWORDS = frozenset((
+    'about', 'above', 'actually', 'after', 'again', 'against', 'already', 'always', 'another',
+    'anything', 'around', 'basically', 'because', 'before', 'being', 'below', 'between', 'could',
+    'doing', 'during', 'every', 'everyone', 'everything', 'first', 'going', 'gonna', 'great', 'having',
+    'itself', 'maybe', 'might', 'never', 'other', 'others', 'really', 'right', 'should',
+    'something', 'sorry', 'still', 'thank', 'thanks', 'their', 'theirs', 'there', 'these', 'thing',
+    'things', 'think', 'those', 'through', 'today', 'under', 'until', 'wanna', 'where', 'which',
+    'while', 'would', 'yours', 'yourself',
+))
+
+
+@functools.lru_cache(maxsize=1)
+def get_audio_devices():
+    """DirectShow audio capture devices, probed once per process"""
+    # FFmpeg's own listing is authoritative: it includes DirectShow-only sources (virtual-audio-capturer,
+    # Stereo Mix) and keeps the order the amix pair is chosen from.
+    # Match on raw bytes; only the device names themselves get decoded
+    result = subprocess.run(
+        ['ffmpeg', '-list_devices', 'true', '-f', 'dshow', '-i', 'dummy'],
+        capture_output=True
+    )
+    return tuple(name.decode('utf-8', 'ignore') for name in _AUDIO_DEVICE_RE.findall(result.stderr))
+
+
+# DeepFace models built once per process; the lock lets callers wait on an in-flight warmup
+_MODELS = {}
+_MODELS_LOCK = threading.Lock()
+# Separate lock: a whisper download must not hold up the emotion thread's model build
+_ASR_MODEL = None
+_ASR_MODEL_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _enable_mixed_precision():
+    """Use float16 compute for Keras models on GPUs; CPUs keep float32, where fp16 is slower"""
+    try:
+        import tensorflow as tf
+        if tf.config.list_physical_devices('GPU'):
+            tf.keras.mixed_precision.set_global_policy('mixed_float16')
+            Logger.print_status("GPU found - building models with mixed_float16")
+    except Exception as e:
+        Logger.print_status(f"Mixed precision unavailable: {e}")
+
+
+def _ensure_model(name):
+    """Build a DeepFace model on first use and return the underlying Keras model"""
+    with _MODELS_LOCK:
+        if name not in _MODELS:
+            # Deferred: importing DeepFace pulls in TensorFlow, which only the emotion thread needs
+            from deepface import DeepFace
+            # Must run before the first Keras model is built; cached, so later builds skip it
+            _enable_mixed_precision()
+            model = DeepFace.build_model(name)
+            # Newer DeepFace versions wrap the Keras model in a client object
+            _MODELS[name] = getattr(model, 'model', model)
+        return _MODELS[name]
+
+
+def _ensure_asr_model():
+    """Load the faster-whisper model once per process: int8 on CPU, int8_float16 on CUDA"""
+    global _ASR_MODEL
+    with _ASR_MODEL_LOCK:
+        if _ASR_MODEL is None:
+            import ctranslate2
+            if ctranslate2.get_cuda_device_count():
+                _ASR_MODEL = WhisperModel("small.en", device="cuda", compute_type="int8_float16")
+            else:
+                _ASR_MODEL = WhisperModel("small.en", device="cpu", compute_type="int8")
+        return _ASR_MODEL
+
+
+def format_duration(seconds):
+    """Format a number of seconds as HH:MM:SS"""
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def write_json_report(path, data):
+    """Write a report as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+# Timestamped console output is configured in settings.LOGGING ('bot.tasks')
+_LOG = logging.getLogger(__name__)
 
 
 class Logger:
     @staticmethod
     def print_status(message):
-        """Enhanced logging function with timestamp"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{timestamp}] [BOT STATUS] {message}")
-        logging.info(message)
+        """Emit a bot status line once through the module logger"""
+        _LOG.info("%s", message)
+
+class _ProfilePool:
+    """Hands out persistent Chrome profile dirs so concurrent bots never share a locked profile"""
+
+    def __init__(self, base_dir, name="my_chrome_profile"):
+        self.base_dir = base_dir
+        self.name = name
+        self._free = queue.SimpleQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reuse an idle (already signed-in) profile, creating a new slot only when all are busy"""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            # Slot 0 keeps the original profile path so existing logins survive
+            suffix = f"_{self._created}" if self._created else ""
+            self._created += 1
+        path = os.path.join(self.base_dir, self.name + suffix)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def release(self, path):
+        self._free.put(path)
+
+
+_PROFILE_POOL = _ProfilePool(os.path.join(os.getcwd(), "chrome_profiles"))
+
 
 class WebDriverManager:
     def __init__(self, headless=False):
         self.headless = headless
         self.driver = None
+        self.profile_dir = None
         
     def initialize(self):
         """Initialize Chrome WebDriver with comprehensive options"""
         print("Initializing Chrome WebDriver...")
         try:
+            grid_url = getattr(settings, 'SELENIUM_GRID_URL', None)
             options = webdriver.ChromeOptions()
             if self.headless:
                 options.add_argument("--headless=new")
@@ -50,15 +223,25 @@ class WebDriverManager:
             options.add_experimental_option("useAutomationExtension", False)
             options.add_argument("--auto-select-desktop-capture-source=Entire screen")
 
-            # Static path for Chrome profile
-            user_data_dir = os.path.join(os.getcwd(), "chrome_profiles", "my_chrome_profile")
-            os.makedirs(user_data_dir, exist_ok=True)
-            options.add_argument(f"--user-data-dir={user_data_dir}")
-            print(f"Using Chrome profile at: {user_data_dir}")
+            # Persistent Chrome profile from the pool, already warmed up by earlier runs.
+            # Pool paths are local to this host, so a grid node keeps its own profile.
+            if not grid_url:
+                self.profile_dir = _PROFILE_POOL.acquire()
+                options.add_argument(f"--user-data-dir={self.profile_dir}")
+                print(f"Using Chrome profile at: {self.profile_dir}")
 
             options.add_argument("--disable-gpu")
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
+            # Skip background work Chrome does on every cold start
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-sync")
+            options.add_argument("--disable-default-apps")
+            options.add_argument("--no-first-run")
+            options.add_argument("--disable-features=TranslateUI,MediaRouter,OptimizationHints")
+            options.add_argument("--metrics-recording-only")
+            # driver.get() returns at DOMContentLoaded; the explicit waits cover the rest
+            options.page_load_strategy = "eager"
             
             prefs = {
                 "credentials_enable_service": False,
@@ -66,8 +249,23 @@ class WebDriverManager:
             }
             options.add_experimental_option("prefs", prefs)
             
-            self.driver = webdriver.Chrome(options=options)
+            try:
+                if grid_url:
+                    # Share the grid's chromedriver instead of spawning one per bot
+                    self.driver = webdriver.Remote(command_executor=grid_url, options=options)
+                    print(f"Connected to Selenium Grid at {grid_url}")
+                    if urlparse(grid_url).hostname not in ('localhost', '127.0.0.1', '::1'):
+                        print("Warning: Selenium Grid node is not local - the recording will not contain the meeting")
+                else:
+                    self.driver = webdriver.Chrome(options=options)
+            except Exception:
+                if self.profile_dir is not None:
+                    _PROFILE_POOL.release(self.profile_dir)
+                    self.profile_dir = None
+                raise
             
+            self._widen_connection_pool()
+
             if not self.headless:
                 self.driver.maximize_window()
                 print("Browser window maximized")
@@ -78,17 +276,36 @@ class WebDriverManager:
             print(f"Failed to initialize WebDriver: {str(e)}")
             raise
 
+    def _widen_connection_pool(self, maxsize=8):
+        """Let concurrent checks reuse keep-alive connections instead of discarding them"""
+        # urllib3 keeps one connection per host by default; parallel participant/speaker
+        # queries would otherwise open and drop a fresh socket on every overlapping command
+        conn = getattr(self.driver.command_executor, '_conn', None)
+        if conn is None:
+            return
+        conn.connection_pool_kw['maxsize'] = maxsize
+        conn.clear()
+
     def quit(self):
         """Close the WebDriver instance"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                print("Browser closed successfully")
-                return True
-            except Exception as e:
-                print(f"Error closing browser: {str(e)}")
-                return False
-        return True
+        closed = True
+        try:
+            if self.driver:
+                try:
+                    self.driver.quit()
+                    print("Browser closed successfully")
+                except Exception as e:
+                    print(f"Error closing browser: {str(e)}")
+                    closed = False
+            return closed
+        finally:
+            if self.profile_dir is not None:
+                if closed:
+                    _PROFILE_POOL.release(self.profile_dir)
+                else:
+                    # Chrome may still hold the profile lock; never hand this slot out again
+                    print(f"Discarding Chrome profile still possibly in use: {self.profile_dir}")
+                self.profile_dir = None
 
 class CookieManager:
     def __init__(self):
@@ -114,9 +331,14 @@ class GoogleMeetAuthenticator:
         """Check if we're logged in by visiting Gmail"""
         try:
             self.driver.get("https://mail.google.com")
+            # Logged-out sessions redirect to the accounts page; stop waiting as soon as either shows up
             WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.PARTIAL_LINK_TEXT, "Inbox"))
+                lambda d: "accounts.google.com" in d.current_url
+                or d.find_elements(By.PARTIAL_LINK_TEXT, "Inbox")
             )
+            if "accounts.google.com" in self.driver.current_url:
+                print("⚠️ Not logged in")
+                return False
             print("✅ Verified logged in via Gmail")
             return True
         except:
@@ -163,14 +385,14 @@ class GoogleMeetAuthenticator:
             )
             print("✅ Successfully logged into Google account")
 
-            # Optional: Handle "Continue as..." screen
-            try:
-                continue_button = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//div[@role='button']//span[contains(text(), 'Continue as')]"))
-                )
-                continue_button.click()
+            # Optional: Handle "Continue as..." screen; probe without blocking since it rarely appears
+            continue_buttons = self.driver.find_elements(
+                By.XPATH, "//div[@role='button']//span[contains(text(), 'Continue as')]"
+            )
+            if continue_buttons:
+                continue_buttons[0].click()
                 print("👉 Clicked 'Continue as'")
-            except TimeoutException:
+            else:
                 print("ℹ️ No 'Continue as' prompt")
 
             return True
@@ -185,6 +407,45 @@ class GoogleMeetAuthenticator:
             return False
 
 class MeetingJoiner:
+    # CSS first (Blink's CSS engine is faster than its XPath evaluator); jQuery-only
+    # ':contains' is not valid CSS, so text matching stays in the single XPath
+    JOIN_BUTTON_CSS = (
+        "button[aria-label*='Join now']",
+        "button[aria-label*='Ask to join']",
+        "div[role='button'][aria-label*='Join']",
+    )
+    JOIN_BUTTON_XPATH = "//span[contains(., 'Join') or contains(., 'Ask')]"
+    # Tries every strategy in-page and clicks the first visible hit; returns the strategy
+    # used or null so WebDriverWait can poll it until the lobby renders
+    _CLICK_JOIN_JS = (
+        "const visible = e => e && e.offsetParent !== null;"
+        "const click = (e, how) => { e.scrollIntoView(); e.click(); return how; };"
+        "for (const sel of arguments[0]) {"
+        "  const e = document.querySelector(sel);"
+        "  if (visible(e)) return click(e, 'css: ' + sel);"
+        "}"
+        "const x = document.evaluate(arguments[1], document, null,"
+        "  XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;"
+        "if (visible(x)) return click(x, 'xpath: ' + arguments[1]);"
+        "const b = Array.from(document.querySelectorAll(\"button,div[role='button']\")).find("
+        "  e => visible(e) && /join|ask/i.test(e.textContent + ' ' + (e.getAttribute('aria-label') || '')));"
+        "if (b) return click(b, 'fallback scan');"
+        "return null;"
+    )
+    DEVICE_TOGGLE_CSS = "[aria-label*='camera' i], [aria-label*='microphone' i]"
+    # Clicks the first "Turn off ..." control per device and reports what was switched off
+    _DISABLE_DEVICES_JS = (
+        "const done = {camera: false, microphone: false};"
+        "for (const el of document.querySelectorAll(arguments[0])) {"
+        "  const label = (el.getAttribute('aria-label') || '').toLowerCase();"
+        "  if (!label.startsWith('turn off')) continue;"
+        "  for (const device of Object.keys(done)) {"
+        "    if (!done[device] && label.includes(device)) { el.click(); done[device] = true; }"
+        "  }"
+        "}"
+        "return done;"
+    )
+
     def __init__(self, driver):
         self.driver = driver
         
@@ -197,59 +458,30 @@ class MeetingJoiner:
 
             # Disable camera and microphone
             Logger.print_status("Attempting to disable camera and microphone")
-            for device in ['camera', 'microphone']:
-                try:
-                    toggle_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, 
-                            f"button[aria-label*='{device}'], div[aria-label*='{device}']"))
-                    )
-                    toggle_btn.click()
-                    Logger.print_status(f"Disabled {device}")
-                    time.sleep(0.5)
-                except Exception as e:
-                    Logger.print_status(f"Could not disable {device}: {str(e)}")
-
-            # Multiple strategies to find and click join button
-            join_button_selectors = [
-                ("css", "button[aria-label*='Join now']"),
-                ("css", "button[aria-label*='Ask to join']"),
-                ("css", "div[role='button'][aria-label*='Join']"),
-                ("xpath", "//span[contains(., 'Join') or contains(., 'Ask')]"),
-                ("css", "button:has(> span:contains('Join')), button:has(> span:contains('Ask'))")
-            ]
+            try:
+                # Wait for the lobby controls once, then flip both toggles in a single call
+                WebDriverWait(self.driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, self.DEVICE_TOGGLE_CSS))
+                )
+                toggled = self.driver.execute_script(self._DISABLE_DEVICES_JS, self.DEVICE_TOGGLE_CSS) or {}
+                for device in ['camera', 'microphone']:
+                    if toggled.get(device):
+                        Logger.print_status(f"Disabled {device}")
+                    else:
+                        Logger.print_status(f"Could not disable {device} (already off or not found)")
+            except Exception as e:
+                Logger.print_status(f"Could not disable camera/microphone: {str(e)}")
 
+            # Multiple strategies to find and click join button, all evaluated in one call per poll
             joined = False
-            for by, selector in join_button_selectors:
-                if joined:
-                    break
-                    
-                try:
-                    Logger.print_status(f"Trying join button with {by}: {selector}")
-                    join_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((by, selector))
-                    )
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", join_btn)
-                    time.sleep(0.5)
-                    join_btn.click()
-                    Logger.print_status(f"✅ Successfully clicked join button using {by} selector: {selector}")
-                    joined = True
-                    break
-                except Exception as e:
-                    Logger.print_status(f"❌ Failed with {by} selector {selector}: {str(e)}")
-
-            if not joined:
-                # Final fallback - click any visible join-like button
-                buttons = self.driver.find_elements(By.CSS_SELECTOR, "button,div[role='button']")
-                for button in buttons:
-                    try:
-                        if any(keyword in button.text.lower() for keyword in ["join", "ask"]) or \
-                           any(keyword in button.get_attribute('aria-label').lower() for keyword in ["join", "ask"]):
-                            button.click()
-                            Logger.print_status("✅ Clicked join button via final fallback")
-                            joined = True
-                            break
-                    except:
-                        continue
+            try:
+                strategy = WebDriverWait(self.driver, 10).until(
+                    lambda d: d.execute_script(self._CLICK_JOIN_JS, list(self.JOIN_BUTTON_CSS), self.JOIN_BUTTON_XPATH)
+                )
+                Logger.print_status(f"✅ Successfully clicked join button using {strategy}")
+                joined = True
+            except TimeoutException:
+                Logger.print_status("❌ No join button found")
 
             return joined
             
@@ -258,28 +490,68 @@ class MeetingJoiner:
             return False
 
 class ParticipantAnalyzer:
-    def __init__(self, driver):
+    PEOPLE_BUTTON_CSS = "button[aria-label^='People']"
+    STATUS_CSS = "div[class*='status'], div[aria-label*='call']"
+    CLOSE_PANEL_CSS = "button[aria-label^='Close']"
+    # Upper bound on the concurrent read-only phase (M1's 5s button wait is the slowest)
+    CHECK_TIMEOUT = 10
+    PARTICIPANT_SELECTORS = (
+        "div[role='listitem']",
+        "div[class*='participant']",
+        "div[aria-label*='participant']",
+    )
+    # Returns [selector, count] for the first selector with visible matches, else null
+    _COUNT_VISIBLE_JS = (
+        "for (const sel of arguments[0]) {"
+        "  const n = Array.from(document.querySelectorAll(sel)).filter(e => e.offsetParent !== null).length;"
+        "  if (n) return [sel, n];"
+        "}"
+        "return null;"
+    )
+
+    def __init__(self, driver, debug_participants=False):
         self.driver = driver
+        # Per-element diagnostics are noisy on the 30s poll, keep them opt-in
+        self.debug_participants = debug_participants
+        # Participant selector that matched the last time the people panel was opened
+        self._participant_selector = None
+        # Highest participant count any method has read, reported at the end of the meeting
+        self.peak_participant_count = 0
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ParticipantCheck")
         
     def check_participants(self):
         """Check if there are other participants in the meeting by trying all methods"""
         Logger.print_status("🔍 Checking participants using multiple methods...")
         try:
-            # Method 1: People button with count
-            method1_result = self._check_participant_count_badge()
-            
-            # Method 2: Open participant panel and count
-            method2_result = self._check_participant_list()
-            
-            # Method 3: Check meeting status messages
-            method3_result = self._check_meeting_status()
-            
+            # M1 and M3 only read the DOM, so they can sit in their WebDriverWaits side by side
+            futures = {
+                self._executor.submit(method): name
+                for name, method in (
+                    ("M1", self._check_participant_count_badge),  # People button with count
+                    ("M3", self._check_meeting_status),  # Check meeting status messages
+                )
+            }
+            results = {}
+            try:
+                for future in as_completed(futures, timeout=self.CHECK_TIMEOUT):
+                    results[futures[future]] = future.result()
+                    # Any positive answer is decisive; don't wait for the slower method
+                    if results[futures[future]] is True:
+                        break
+            except FuturesTimeout:
+                pass
+
+            # M2 opens and closes the people panel, which would change what M1/M3 read;
+            # run it alone and only when both read-only methods said nobody is here
+            if results.get("M1") is False and results.get("M3") is False:
+                results["M2"] = self._check_participant_list()  # Open participant panel and count
+
             # Final Decision
-            Logger.print_status(f"🧮 Final method results -> M1: {method1_result}, M2: {method2_result}, M3: {method3_result}")
+            Logger.print_status(f"🧮 Final method results -> {results}")
 
-            if any(res is True for res in [method1_result, method2_result, method3_result]):
+            if any(res is True for res in results.values()):
                 return True
-            elif all(res is False for res in [method1_result, method2_result, method3_result]):
+            elif len(results) == 3 and all(res is False for res in results.values()):
                 return False
             else:
                 Logger.print_status("⚠️ Inconclusive results — assuming participants present.")
@@ -289,22 +561,34 @@ class ParticipantAnalyzer:
             Logger.print_status(f"Error checking participants: {str(e)}")
             return True
 
+    def stop(self):
+        """Drop queued participant checks; in-flight ones finish on their own"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_participant_count(self):
+        """Return the largest participant count seen during the meeting"""
+        return self.peak_participant_count
+
+    def _record_count(self, count):
+        self.peak_participant_count = max(self.peak_participant_count, count)
+
     def _check_participant_count_badge(self):
         """Check participant count using the people button badge"""
         try:
             Logger.print_status("👉 Method 1: People button badge...")
             people_button = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label^='People']"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.PEOPLE_BUTTON_CSS))
             )
             count_text = people_button.text
-            Logger.print_status(f"🧾 People Button Text: {count_text}")
+            if self.debug_participants:
+                Logger.print_status(f"🧾 People Button Text: {count_text}")
             
             if count_text:
-                import re
-                match = re.search(r'\(?(\d+)\)?', count_text)
+                match = _COUNT_RE.search(count_text)
                 if match:
                     count = int(match.group(1))
-                    Logger.print_status(f"✅ Method 1 count: {count}")
+                    self._record_count(count)
+                    _LOG.debug("✅ Method 1 count: %s", count)
                     return count > 1
                 elif 'people' in count_text.lower():
                     Logger.print_status("✅ No count in text — likely alone.")
@@ -319,75 +603,72 @@ class ParticipantAnalyzer:
         try:
             Logger.print_status("👉 Method 2: Opening people panel...")
             people_button = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[aria-label^='People']"))
+                EC.element_to_be_clickable((By.CSS_SELECTOR, self.PEOPLE_BUTTON_CSS))
             )
             people_button.click()
-            time.sleep(1)
-
-            participant_selectors = [
-                "div[role='listitem']",
-                "div[class*='participant']",
-                "div[aria-label*='participant']"
-            ]
 
-            for selector in participant_selectors:
+            try:
+                # Re-count with the selector that matched last time; probe them all only once
+                selectors = [self._participant_selector] if self._participant_selector else list(self.PARTICIPANT_SELECTORS)
+                # Query, visibility test and count all run in-page; poll until the list renders
                 try:
-                    participants = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
+                    result = WebDriverWait(self.driver, 3).until(
+                        lambda d: d.execute_script(self._COUNT_VISIBLE_JS, selectors)
                     )
-                    count = len(participants)
-                    Logger.print_status(f"✅ Method 2 count: {count} using selector: {selector}")
-                    
-                    # Try to close people panel
-                    try:
-                        close_buttons = self.driver.find_elements(By.CSS_SELECTOR, "button[aria-label^='Close']")
-                        for btn in close_buttons:
-                            try:
-                                btn.click()
-                                break
-                            except:
-                                continue
-                    except:
-                        pass
-                    
-                    return count > 1
-                except:
-                    continue
-            return False
+                except TimeoutException:
+                    # Meet may have changed its markup; probe every selector next time
+                    self._participant_selector = None
+                    return False
+
+                selector, count = result
+                self._participant_selector = selector
+                self._record_count(count)
+                _LOG.debug("✅ Method 2 count: %s using selector: %s", count, selector)
+                return count > 1
+            finally:
+                # The recording captures the browser window, so the meeting grid must not stay shrunk
+                self._close_people_panel()
         except Exception as e:
             Logger.print_status(f"❌ Method 2 failed: {e}")
             return False
 
+    def _close_people_panel(self):
+        """Close the people side panel again"""
+        for button in self.driver.find_elements(By.CSS_SELECTOR, self.CLOSE_PANEL_CSS):
+            try:
+                button.click()
+                return
+            except Exception:
+                continue
+
     def _check_meeting_status(self):
         """Check participants by examining meeting status messages"""
         try:
             Logger.print_status("👉 Method 3: Checking meeting status text...")
-            status_elements = self.driver.find_elements(
-                By.CSS_SELECTOR, "div[class*='status'], div[aria-label*='call']"
-            )
+            # Read every status text in one round trip instead of one .text call per element
+            status_texts = self.driver.execute_script(
+                "return Array.from(document.querySelectorAll(arguments[0])).map(e => e.innerText || '');",
+                self.STATUS_CSS
+            ) or []
             
-            for element in status_elements:
-                try:
-                    text = element.text.strip().lower()
-                    if not text:  # Skip empty elements
-                        continue
-                        
-                    Logger.print_status(f"Found status text: {text}")
-                    
-                    if 'alone' in text or 'waiting' in text:
-                        Logger.print_status("✅ Status: Alone in meeting.")
-                        return False
-                    elif 'participant' in text or 'people' in text:
-                        Logger.print_status(f"✅ Status mentions participants: {text}")
-                        return True
-                    elif 'joined' in text or 'connected' in text:
-                        Logger.print_status("✅ Status indicates someone joined")
-                        return True
-                        
-                except Exception as element_error:
-                    Logger.print_status(f"⚠️ Error processing element: {element_error}")
+            for raw_text in status_texts:
+                text = raw_text.strip().lower()
+                if not text:  # Skip empty elements
                     continue
                     
+                if self.debug_participants:
+                    Logger.print_status(f"Found status text: {text}")
+                
+                if 'alone' in text or 'waiting' in text:
+                    Logger.print_status("✅ Status: Alone in meeting.")
+                    return False
+                elif 'participant' in text or 'people' in text:
+                    Logger.print_status(f"✅ Status mentions participants: {text}")
+                    return True
+                elif 'joined' in text or 'connected' in text:
+                    Logger.print_status("✅ Status indicates someone joined")
+                    return True
+                    
             Logger.print_status("No conclusive status found")
             return False
             
@@ -396,12 +677,31 @@ class ParticipantAnalyzer:
             return False
         
 class MeetingRecorder:
-    def __init__(self, filename, duration):
+    # Windows encoders only: capture is gdigrab/ddagrab + dshow, so Linux-only VAAPI can never run
+    HW_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_amf')
+    # Drop near-identical frames (static slides) before they reach the encoder
+    DECIMATE_FILTER = 'mpdecimate=hi=64*12:lo=64*5:frac=0.33'
+    # Keyframe every 4s of wall time so recordings seek predictably; a frame-count GOP would
+    # stretch far past that once mpdecimate thins static stretches of the VFR stream
+    KEYFRAME_EXPR = 'expr:gte(t,n_forced*4)'
+    _hw_encoders = None
+    _ddagrab_available = None
+
+    def __init__(self, filename, duration, capture_fps=15, software_size=(1280, 720)):
         self.filename = filename
         self.duration = duration
+        # Meet is mostly talking heads and slides; 15 fps is plenty and halves encode work
+        self.capture_fps = capture_fps
+        # libx264 runs on the CPU, so it encodes a downscaled copy; GPU encoders keep 1080p
+        self.software_size = software_size
         self.ffmpeg_process = None
         self.recording_start_time = None
-        self.should_stop = False
+        self._stderr_ring = deque(maxlen=256)
+        self._stderr_thread = None
+        self.stream_path = None
+        self._remux_thread = None
+        # Monitor and MeetBot.stop() both stop the recorder; only the first call finalizes
+        self._stop_lock = threading.Lock()
         
     def start_recording(self):
         """Start screen recording with multiple fallback methods"""
@@ -414,9 +714,17 @@ class MeetingRecorder:
                 
             output_path = os.path.abspath(self.filename)
             Logger.print_status(f"Output will be saved to: {output_path}")
+            # Record into MPEG-TS (playable even if the bot dies) and remux to MP4 afterwards
+            self.stream_path = os.path.splitext(output_path)[0] + '.ts'
 
             # Define recording methods in order of preference
-            recording_methods = self._get_recording_methods(output_path)
+            recording_methods = self._get_recording_methods(self.stream_path)
+
+            # Hide FFmpeg's window without CREATE_NO_WINDOW: a hidden console of its own would
+            # never receive the CTRL_BREAK_EVENT sent from ours at shutdown
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
 
             # Try each method until one succeeds
             last_error = None
@@ -426,23 +734,41 @@ class MeetingRecorder:
                     self.ffmpeg_process = subprocess.Popen(
                         method,
                         stdin=subprocess.PIPE,
-                        stdout=subprocess.PIPE,
+                        bufsize=0,
+                        stdout=subprocess.DEVNULL,
                         stderr=subprocess.PIPE,
-                        creationflags=subprocess.CREATE_NO_WINDOW,
-                        shell=True
+                        # Own process group so CTRL_BREAK_EVENT reaches FFmpeg alone at shutdown
+                        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+                        startupinfo=startupinfo
                     )
+                    self._stderr_ring = deque(maxlen=256)
+                    self._stderr_thread = threading.Thread(
+                        target=self._drain_stderr,
+                        args=(self.ffmpeg_process.stderr, self._stderr_ring),
+                        daemon=True,
+                        name="FFmpegStderrThread"
+                    )
+                    self._stderr_thread.start()
+                    self._raise_encoder_priority()
                     
-                    # Verify process started successfully
-                    time.sleep(2)
+                    # Verify process started successfully; a method that fails fast frees us early
+                    try:
+                        self.ffmpeg_process.wait(timeout=2)
+                    except subprocess.TimeoutExpired:
+                        pass
                     if self.ffmpeg_process.poll() is None:
                         Logger.print_status("Recording started successfully")
                         self.recording_start_time = datetime.now()
                         return True
                     else:
-                        error = self.ffmpeg_process.stderr.read().decode('utf-8', errors='ignore')
+                        self._stderr_thread.join(timeout=1)
+                        error = self._get_stderr_tail()
                         last_error = error
                         Logger.print_status(f"Recording attempt failed: {error}")
                         self.ffmpeg_process.kill()
+                        if _DSHOW_OPEN_ERROR_RE.search(error):
+                            # Device list may be stale (headset unplugged); re-probe next time
+                            self.invalidate_device_cache()
                 except Exception as e:
                     last_error = str(e)
                     Logger.print_status(f"Error starting recording process: {str(e)}")
@@ -451,70 +777,240 @@ class MeetingRecorder:
             
         except Exception as e:
             Logger.print_status(f"Critical error starting recording: {str(e)}")
-            if hasattr(self, 'ffmpeg_process') and self.ffmpeg_process:
+            if self.ffmpeg_process is not None:
                 self.ffmpeg_process.kill()
             raise
 
+    @staticmethod
+    def _drain_stderr(pipe, ring):
+        """Keep FFmpeg's stderr flowing so a full pipe can never block the encoder"""
+        for line in iter(pipe.readline, b''):
+            ring.append(line)
+
+    def _get_stderr_tail(self):
+        """Last lines FFmpeg wrote to stderr"""
+        return b''.join(self._stderr_ring).decode('utf-8', errors='ignore')
+
+    def _raise_encoder_priority(self):
+        """Run FFmpeg above normal priority so analysis threads can't starve the encoder"""
+        if psutil is None:
+            return
+        try:
+            process = psutil.Process(self.ffmpeg_process.pid)
+            if os.name == 'nt':
+                process.nice(psutil.HIGH_PRIORITY_CLASS)
+            else:
+                process.nice(-5)
+        except (psutil.Error, OSError) as e:
+            Logger.print_status(f"Could not raise FFmpeg priority: {e}")
+
+    @classmethod
+    def _detect_hw_encoders(cls):
+        """Probe once which hardware H.264 encoders actually work on this machine"""
+        if cls._hw_encoders is None:
+            # Builds ship nvenc/qsv/amf together whatever the GPU, so '-encoders' proves nothing;
+            # a one-frame encode fails fast when the hardware or driver is missing
+            cls._hw_encoders = set()
+            for name in cls.HW_ENCODERS:
+                pix_fmt = 'nv12' if name == 'h264_qsv' else 'yuv420p'
+                try:
+                    result = subprocess.run(
+                        ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-f', 'lavfi', '-i', 'nullsrc=s=256x256',
+                         '-frames:v', '1', '-c:v', name, '-pix_fmt', pix_fmt, '-f', 'null', '-'],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10
+                    )
+                except (OSError, subprocess.SubprocessError):
+                    continue
+                if result.returncode == 0:
+                    cls._hw_encoders.add(name)
+            Logger.print_status(f"Hardware encoders available: {sorted(cls._hw_encoders) or 'none'}")
+        return cls._hw_encoders
+
+    @classmethod
+    def _has_ddagrab(cls):
+        """Probe once whether FFmpeg can capture via Desktop Duplication (ddagrab)"""
+        if cls._ddagrab_available is None:
+            try:
+                result = subprocess.run(
+                    ['ffmpeg', '-hide_banner', '-filters'],
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10
+                )
+                cls._ddagrab_available = 'ddagrab' in result.stdout
+            except (OSError, subprocess.SubprocessError):
+                cls._ddagrab_available = False
+        return cls._ddagrab_available
+
+    def _get_video_pipelines(self):
+        """Capture input + encoder argument pairs in order of preference"""
+        pipelines = []
+        # -nostats: progress lines end in '\r', so the stderr drain would grow one endless line
+        # ddagrab frames stay in D3D11 memory and NVENC encodes them without a CPU copy
+        if self._has_ddagrab() and 'h264_nvenc' in self._detect_hw_encoders():
+            pipelines.append((
+                ['ffmpeg', '-nostats', '-f', 'lavfi', '-i', f'ddagrab=output_idx=0:framerate={self.capture_fps}'],
+                ['-c:v', 'h264_nvenc', '-preset', 'p1', '-tune', 'll', '-zerolatency', '1',
+                 '-rc', 'cbr', '-b:v', '2M', '-force_key_frames', self.KEYFRAME_EXPR]
+            ))
+        gdigrab_input = ['ffmpeg', '-nostats', '-f', 'gdigrab', '-framerate', str(self.capture_fps),
+                         '-video_size', '1920x1080', '-i', 'desktop']
+        # Dropped frames keep their original timestamps (VFR) so audio stays in sync
+        for encoder in self._get_video_encoders():
+            pipelines.append((gdigrab_input, encoder + ['-vsync', 'vfr']))
+        return pipelines
+
+    def _get_video_encoders(self):
+        """Video encoder arguments in order of preference"""
+        available = self._detect_hw_encoders()
+        width, height = self.software_size
+        encoders = []
+        if 'h264_nvenc' in available:
+            encoders.append([
+                '-vf', self.DECIMATE_FILTER,
+                '-c:v', 'h264_nvenc', '-preset', 'p1', '-tune', 'll', '-zerolatency', '1',
+                '-rc', 'cbr', '-b:v', '2M', '-pix_fmt', 'yuv420p', '-force_key_frames', self.KEYFRAME_EXPR
+            ])
+        if 'h264_qsv' in available:
+            encoders.append([
+                '-vf', self.DECIMATE_FILTER,
+                '-c:v', 'h264_qsv', '-preset', 'veryfast', '-b:v', '2M', '-pix_fmt', 'nv12',
+                '-force_key_frames', self.KEYFRAME_EXPR
+            ])
+        if 'h264_amf' in available:
+            encoders.append([
+                '-vf', self.DECIMATE_FILTER,
+                '-c:v', 'h264_amf', '-usage', 'lowlatency', '-quality', 'speed',
+                '-rc', 'cbr', '-b:v', '2M', '-pix_fmt', 'yuv420p', '-force_key_frames', self.KEYFRAME_EXPR
+            ])
+        # Slice threading + zerolatency avoids libx264's frame-threading delay
+        encoders.append([
+            '-vf', f'{self.DECIMATE_FILTER},scale={width}:{height}',
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'zerolatency',
+            '-x264-params', 'sliced-threads=1:threads=auto:scenecut=0:ref=1', '-pix_fmt', 'yuv420p',
+            '-force_key_frames', self.KEYFRAME_EXPR
+        ])
+        return encoders
+
     def _get_recording_methods(self, output_path):
         """Generate different recording method commands based on available audio devices"""
         methods = []
         available_devices = self._get_audio_devices()
         Logger.print_status(f"Available audio devices: {available_devices}")
+        video_pipelines = self._get_video_pipelines()
 
         # Method 1: Both audio devices
         if len(available_devices) >= 2:
-            methods.append([
-                'ffmpeg', '-f', 'gdigrab', '-framerate', '30', '-video_size', '1920x1080', '-i', 'desktop',
-                '-f', 'dshow', '-i', f'audio={available_devices[0]}',
-                '-f', 'dshow', '-i', f'audio={available_devices[1]}',
-                '-filter_complex', '[1:a][2:a]amix=inputs=2[a]',
-                '-map', '0:v', '-map', '[a]',
-                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
-                '-c:a', 'aac', '-b:a', '192k', '-movflags', '+faststart',
-                '-y', output_path
-            ])
+            for video_input, encoder in video_pipelines:
+                methods.append(video_input + [
+                    '-f', 'dshow', '-i', f'audio={available_devices[0]}',
+                    '-f', 'dshow', '-i', f'audio={available_devices[1]}',
+                    '-filter_complex', '[1:a][2:a]amix=inputs=2[a]',
+                    '-map', '0:v', '-map', '[a]',
+                ] + encoder + [
+                    '-c:a', 'aac', '-b:a', '192k', '-f', 'mpegts',
+                    '-y', output_path
+                ])
 
         # Method 2: Single audio device
         if available_devices:
-            methods.append([
-                'ffmpeg', '-f', 'gdigrab', '-framerate', '30', '-video_size', '1920x1080', '-i', 'desktop',
-                '-f', 'dshow', '-i', f'audio={available_devices[0]}',
-                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
-                '-c:a', 'aac', '-b:a', '192k', '-movflags', '+faststart',
-                '-y', output_path
-            ])
+            for video_input, encoder in video_pipelines:
+                methods.append(video_input + [
+                    '-f', 'dshow', '-i', f'audio={available_devices[0]}',
+                ] + encoder + [
+                    '-c:a', 'aac', '-b:a', '192k', '-f', 'mpegts',
+                    '-y', output_path
+                ])
 
         # Method 3: Video only
-        methods.append([
-            'ffmpeg', '-f', 'gdigrab', '-framerate', '30', '-video_size', '1920x1080', '-i', 'desktop',
-            '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
-            '-an', '-movflags', '+faststart', '-y', output_path
-        ])
+        for video_input, encoder in video_pipelines:
+            methods.append(video_input + encoder + [
+                '-an', '-f', 'mpegts', '-y', output_path
+            ])
         
         return methods
 
-    def _get_audio_devices(self):
+    @staticmethod
+    def invalidate_device_cache():
+        """Forget the cached DirectShow device list so the next recording re-probes it"""
+        get_audio_devices.cache_clear()
+
+    @staticmethod
+    def _get_audio_devices():
         """Get list of available audio devices"""
         try:
-            result = subprocess.run(
-                ['ffmpeg', '-list_devices', 'true', '-f', 'dshow', '-i', 'dummy'],
-                stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True
-            )
-            devices = []
-            for line in result.stderr.split('\n'):
-                if 'audio' in line.lower() and 'dshow' in line.lower():
-                    device = line.split('"')[1]
-                    devices.append(device)
-            return devices
+            return list(get_audio_devices())
         except Exception as e:
             Logger.print_status(f"Error detecting audio devices: {str(e)}")
             return []
 
+    def _remux_to_mp4(self):
+        """Copy the MPEG-TS recording into the final MP4 and drop the TS on success"""
+        Logger.print_status(f"Remuxing recording to {self.filename}")
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-i', self.stream_path,
+                 '-c', 'copy', '-movflags', '+faststart', '-f', 'mp4', '-y', os.path.abspath(self.filename)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+            if result.returncode == 0 and self._validate_mp4(self.filename):
+                os.remove(self.stream_path)
+                Logger.print_status("Recording file is valid")
+            else:
+                error = result.stderr.decode('utf-8', errors='ignore')
+                Logger.print_status(f"Warning: Remux failed, keeping {self.stream_path}: {error}")
+        except OSError as e:
+            Logger.print_status(f"Could not remux recording, keeping {self.stream_path}: {e}")
+
+    @staticmethod
+    def _validate_mp4(path):
+        """Check the MP4 box layout: ftyp first and a moov box somewhere at top level"""
+        with open(path, 'rb') as f:
+            header = f.read(8)
+            if len(header) < 8 or header[4:8] != b'ftyp':
+                return False
+            f.seek(0, os.SEEK_END)
+            file_size = f.tell()
+            offset = 0
+            # Walk the top-level boxes; with +faststart moov follows ftyp directly
+            while offset + 8 <= file_size:
+                f.seek(offset)
+                box = f.read(16)
+                size = int.from_bytes(box[0:4], 'big')
+                if box[4:8] == b'moov':
+                    return True
+                if size == 1 and len(box) == 16:
+                    size = int.from_bytes(box[8:16], 'big')
+                elif size == 0:
+                    break
+                if size < 8:
+                    return False
+                offset += size
+        return False
+
+    def wait_for_recording(self, timeout=None):
+        """Wait for the MP4 remux and return the recording file that actually exists"""
+        if self._remux_thread is not None:
+            self._remux_thread.join(timeout)
+            if self._remux_thread.is_alive():
+                # Still copying: the MP4 is incomplete, but the TS stays until the remux succeeds
+                return self.stream_path
+        for path in (os.path.abspath(self.filename), self.stream_path):
+            if path and os.path.exists(path):
+                return path
+        return None
+
     def stop_recording(self):
-        """Gracefully stop the recording process"""
+        """Gracefully stop the recording process; later calls are no-ops"""
+        with self._stop_lock:
+            try:
+                self._stop_recording()
+            finally:
+                self.ffmpeg_process = None
+
+    def _stop_recording(self):
         Logger.print_status("Beginning recording shutdown process")
         
-        if not hasattr(self, 'ffmpeg_process') or not self.ffmpeg_process:
+        if self.ffmpeg_process is None:
             Logger.print_status("No recording process to stop")
             return
 
@@ -527,6 +1023,12 @@ class MeetingRecorder:
                 Logger.print_status("Sent quit command to FFmpeg")
             except:
                 Logger.print_status("Could not send quit command to FFmpeg")
+            finally:
+                # EOF on stdin also tells FFmpeg to finish if the 'q' was missed
+                try:
+                    self.ffmpeg_process.stdin.close()
+                except OSError:
+                    pass
 
             # Wait for process to finish
             try:
@@ -534,82 +1036,79 @@ class MeetingRecorder:
                 self.ffmpeg_process.wait(timeout=15)
                 Logger.print_status("FFmpeg exited cleanly")
             except subprocess.TimeoutExpired:
-                Logger.print_status("FFmpeg did not exit - terminating")
-                self.ffmpeg_process.terminate()
+                # CTRL_BREAK lets FFmpeg flush and close the output; terminate() would not
+                Logger.print_status("FFmpeg did not exit - sending CTRL_BREAK")
                 try:
+                    self.ffmpeg_process.send_signal(signal.CTRL_BREAK_EVENT)
                     self.ffmpeg_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    Logger.print_status("FFmpeg did not terminate - killing")
-                    self.ffmpeg_process.kill()
-
-            # Verify output file
-            if os.path.exists(self.filename):
-                file_size = os.path.getsize(self.filename) / (1024 * 1024)  # in MB
-                Logger.print_status(f"Recording saved successfully - Size: {file_size:.2f} MB")
-                
-                # Validate file
-                try:
-                    result = subprocess.run(
-                        ['ffprobe', '-v', 'error', '-show_format', self.filename],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        timeout=5
-                    )
-                    if result.returncode == 0:
-                        Logger.print_status("Recording file is valid")
-                    else:
-                        Logger.print_status("Warning: Recording file might be corrupted")
-                except:
-                    Logger.print_status("Could not validate recording file")
-            else:
+                except (OSError, subprocess.TimeoutExpired):
+                    # OSError: no console to raise the event from (e.g. a service-hosted Django)
+                    Logger.print_status("FFmpeg did not exit - terminating")
+                    self.ffmpeg_process.terminate()
+                    try:
+                        self.ffmpeg_process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        Logger.print_status("FFmpeg did not terminate - killing")
+                        self.ffmpeg_process.kill()
+
+            # Surface FFmpeg's own diagnostics from the drained stderr ring, no extra read needed
+            if self.ffmpeg_process.returncode not in (0, None):
+                self._stderr_thread.join(timeout=1)
+                Logger.print_status(
+                    f"FFmpeg exited with code {self.ffmpeg_process.returncode}: {self._get_stderr_tail()[-2000:]}"
+                )
+
+            # Verify output file; a single stat both checks existence and gets the size
+            try:
+                file_size = os.path.getsize(self.stream_path) / (1024 * 1024)  # in MB
+            except FileNotFoundError:
                 Logger.print_status("Error: Recording file was not created")
+                return
+
+            Logger.print_status(f"Recording saved successfully - Size: {file_size:.2f} MB")
+
+            # Container swap only (-c copy); non-daemon so interpreter exit can't truncate the MP4
+            self._remux_thread = threading.Thread(target=self._remux_to_mp4, name="RemuxThread")
+            self._remux_thread.start()
 
         except Exception as e:
             Logger.print_status(f"Error stopping recording: {str(e)}")
-            if hasattr(self, 'ffmpeg_process') and self.ffmpeg_process:
+            if self.ffmpeg_process is not None:
                 self.ffmpeg_process.kill()
 
 
 class MeetingMonitor:
+    PARTICIPANT_CHECK_INTERVAL = 30
+
     def __init__(self, driver, recorder, participant_analyzer, duration):
         self.driver = driver
         self.recorder = recorder
         self.participant_analyzer = participant_analyzer
         self.duration = duration
-        self.should_stop = False
+        self._stop_event = threading.Event()
+        self._timer = None
+        self._start_time = None
+        self._participants_check_count = 0
+
+    def stop(self):
+        """Wake the monitor loop immediately and end monitoring"""
+        self._stop_event.set()
+        if self._timer is not None:
+            self._timer.cancel()
         
     def monitor(self):
         """Monitor the recording session and meeting status"""
         Logger.print_status(f"Starting recording monitor for {self.duration} minutes")
-        start_time = time.time()
-        end_time = start_time + (self.duration * 60)
-        last_participant_check = 0
-        participants_check_count = 0
+        self._start_time = time.monotonic()
+        self._participants_check_count = 0
         
         try:
-            while time.time() < end_time and not self.should_stop:
-                current_time = time.time()
-                elapsed = int(current_time - start_time)
-                remaining = int(end_time - current_time)
-                
-                Logger.print_status(f"Recording in progress - Elapsed: {elapsed}s, Remaining: {remaining}s")
-
-                # Check participants periodically
-                if current_time - last_participant_check > 30 and elapsed > 20:
-                    last_participant_check = current_time
-                    if not self.participant_analyzer.check_participants():
-                        participants_check_count += 1
-                        Logger.print_status(f"No participants detected ({participants_check_count}/2 checks)")
-                        
-                        if participants_check_count >= 2:
-                            Logger.print_status("No participants for 1 minute - ending recording")
-                            self.should_stop = True
-                            break
-                    else:
-                        participants_check_count = 0
-                
-                # 10 seconds gap between participent check
-                time.sleep(10)
+            # Participant checks run on a timer; this thread just blocks until the
+            # duration elapses or stop() / a failed check wakes it
+            self._schedule_participant_tick()
+            self._stop_event.wait(timeout=self.duration * 60)
+            if self._timer is not None:
+                self._timer.cancel()
 
             # Recording completed normally
             Logger.print_status("Recording duration completed - stopping recording")
@@ -620,15 +1119,243 @@ class MeetingMonitor:
             self.recorder.stop_recording()
             raise
 
+    def _schedule_participant_tick(self):
+        """Arm the next participant check unless monitoring has ended"""
+        if self._stop_event.is_set():
+            return
+        self._timer = threading.Timer(self.PARTICIPANT_CHECK_INTERVAL, self._participant_tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _participant_tick(self):
+        """Periodic status + participant check; ends monitoring when the meeting empties"""
+        elapsed = int(time.monotonic() - self._start_time)
+        remaining = max(0, self.duration * 60 - elapsed)
+        Logger.print_status(f"Recording in progress - Elapsed: {elapsed}s, Remaining: {remaining}s")
+
+        process = self.recorder.ffmpeg_process
+        if process is not None and process.poll() is not None:
+            Logger.print_status("FFmpeg exited unexpectedly - ending recording")
+            self._stop_event.set()
+            return
+
+        try:
+            if not self.participant_analyzer.check_participants():
+                self._participants_check_count += 1
+                Logger.print_status(f"No participants detected ({self._participants_check_count}/2 checks)")
+
+                if self._participants_check_count >= 2:
+                    Logger.print_status("No participants for 1 minute - ending recording")
+                    self._stop_event.set()
+                    return
+            else:
+                self._participants_check_count = 0
+        except Exception as e:
+            Logger.print_status(f"Participant check failed: {str(e)}")
+
+        self._schedule_participant_tick()
+
+class MeetingDataAggregator:
+    """Single writer for transcript/emotion data produced by the capture threads"""
+
+    def __init__(self):
+        # Transcript is stored column-wise per speaker: parallel timestamp/text lists
+        self.transcript_by_speaker = defaultdict(lambda: {'timestamps': [], 'texts': []})
+        # Emotion samples are stored column-wise; per-person dicts are only built for reports
+        self.emotion_people = []
+        self.emotion_labels = []
+        self.emotion_times = array('d')
+        self.emotion_confidences = array('d')
+        self.transcript_q = queue.SimpleQueue()
+        self.emotion_q = queue.SimpleQueue()
+        self.stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._aggregate, daemon=True, name="AggregatorThread")
+        self._thread.start()
+
+    def _drain(self):
+        drained = False
+        while not self.transcript_q.empty():
+            speaker, timestamp, text = self.transcript_q.get()
+            columns = self.transcript_by_speaker[speaker]
+            columns['timestamps'].append(timestamp)
+            columns['texts'].append(text)
+            drained = True
+        while not self.emotion_q.empty():
+            face_id, ts, emotion, confidence = self.emotion_q.get()
+            self.emotion_people.append(face_id)
+            self.emotion_labels.append(emotion)
+            self.emotion_times.append(ts)
+            self.emotion_confidences.append(confidence)
+            drained = True
+        return drained
+
+    def get_emotions_by_person(self):
+        """Rebuild the per-person emotion lists from the column store"""
+        n = len(self.emotion_confidences)  # last column written, so every column has n rows
+        emotions_by_person = defaultdict(list)
+        for i in range(n):
+            emotions_by_person[self.emotion_people[i]].append({
+                'timestamp': datetime.fromtimestamp(self.emotion_times[i]).strftime('%H:%M:%S'),
+                'emotion': self.emotion_labels[i],
+                'confidence': self.emotion_confidences[i]
+            })
+        return dict(emotions_by_person)
+
+    def _aggregate(self):
+        while not self.stop_event.is_set():
+            if not self._drain():
+                self.stop_event.wait(0.1)
+        self._drain()
+
+    def stop(self):
+        """Stop the writer thread after flushing anything still queued"""
+        self.stop_event.set()
+        self._thread.join(timeout=5)
+
+
+class AudioRingBuffer:
+    """Fixed-capacity float32 audio window that keeps only the most recent samples"""
+
+    def __init__(self, capacity):
+        self.data = np.zeros(capacity, dtype=np.float32)
+        self.length = 0
+
+    def append(self, chunk):
+        chunk = chunk[-len(self.data):]
+        overflow = self.length + len(chunk) - len(self.data)
+        if overflow > 0:
+            self.consume(overflow)
+        self.data[self.length:self.length + len(chunk)] = chunk
+        self.length += len(chunk)
+
+    def consume(self, n_samples):
+        """Drop the oldest n_samples from the window"""
+        n_samples = min(n_samples, self.length)
+        self.data[:self.length - n_samples] = self.data[n_samples:self.length]
+        self.length -= n_samples
+
+    def view(self):
+        return self.data[:self.length]
+
+
 class AudioTranscriber:
-    def __init__(self, driver):
+    SAMPLE_RATE = 16000
+    # Longest audio window kept for local decoding (seconds)
+    BUFFER_SECONDS = 30
+    # Decoding is skipped unless this share of 30ms frames contains speech
+    MIN_SPEECH_RATIO = 0.1
+    # Relative energy-threshold drift that triggers ambient noise recalibration
+    RECALIBRATE_DRIFT = 0.3
+    SPEAKER_TILE_CSS = "div[jsname][class*='Kqi1ib'], div[class*='Kqi1ib']"
+    NAMED_ELEMENT_CSS = "div[data-self-name], div[aria-label], div[title]"
+    # First plausible participant name carried by an element
+    _PICK_NAME_JS = """
+        const pick = el => {
+            for (const v of [el.getAttribute('data-self-name'), el.getAttribute('aria-label'),
+                             el.getAttribute('title'), el.innerText]) {
+                const t = (v || '').trim();
+                if (t.length > 2 && t.length < 50) return t;
+            }
+            return null;
+        };
+    """
+    # Everything the tile heuristics need, gathered in-page for all tiles in one call;
+    # the full attribute dump (arguments[1]) is only collected for DEBUG logging
+    _TILE_DUMP_JS = _PICK_NAME_JS + """
+        const withAttrs = arguments[1];
+        return Array.from(document.querySelectorAll(arguments[0])).map(tile => {
+            const attrs = {};
+            if (withAttrs) for (const a of tile.attributes) attrs[a.name] = a.value;
+            const cls = tile.getAttribute('class') || '';
+            const style = tile.getAttribute('style') || '';
+            const cue = cls.includes('border') || cls.includes('pulse')
+                || style.includes('scale') || style.includes('z-index');
+            let nested = null;
+            if (cue) {
+                for (const child of tile.querySelectorAll('*')) {
+                    nested = pick(child);
+                    if (nested) break;
+                }
+            }
+            const raw = (tile.getAttribute('data-self-name') || tile.getAttribute('aria-label')
+                || tile.innerText || '').trim();
+            const name = (tile.getAttribute('data-self-name') || tile.getAttribute('aria-label')
+                || tile.getAttribute('title') || tile.innerText || '').trim();
+            return {attrs: attrs, cue: cue, nested: nested, raw: raw, name: name};
+        });
+    """
+    # Strategy 3 without diagnostics: first named element, resolved in-page
+    _FIRST_NAME_JS = """
+        for (const el of document.querySelectorAll(arguments[0])) {
+            const name = (el.getAttribute('data-self-name') || el.getAttribute('aria-label')
+                || el.getAttribute('title') || el.innerText || '').trim();
+            if (name) return name;
+        }
+        return null;
+    """
+    # Installed once per page: resolves the speaker as Meet mutates tile classes/styles and
+    # parks it in window.__activeSpeaker, so polling is a single property read
+    _SPEAKER_OBSERVER_JS = _PICK_NAME_JS + """
+        if (window.__speakerObserver) return true;
+        const tileSel = arguments[0];
+        const resolve = el => {
+            if (!el.getAttribute) return null;
+            const label = el.getAttribute('aria-label') || '';
+            if (label.includes('is speaking')) return label.replace(' is speaking', '').trim();
+            const tile = el.closest(tileSel);
+            if (!tile) return null;
+            const cls = tile.getAttribute('class') || '';
+            const style = tile.getAttribute('style') || '';
+            if (!(cls.includes('border') || cls.includes('pulse')
+                  || style.includes('scale') || style.includes('z-index'))) return null;
+            for (const child of tile.querySelectorAll('*')) {
+                const name = pick(child);
+                if (name) return name;
+            }
+            return null;
+        };
+        window.__activeSpeaker = null;
+        window.__speakerObserver = new MutationObserver(mutations => {
+            for (const m of mutations) {
+                const name = resolve(m.target);
+                if (name) { window.__activeSpeaker = name; break; }
+            }
+        });
+        window.__speakerObserver.observe(document.querySelector('[role=main]') || document.body, {
+            attributes: true, subtree: true, attributeFilter: ['class', 'style', 'aria-label']
+        });
+        return true;
+    """
+    # null means the observer is gone (page reloaded) and must be reinstalled
+    _READ_SPEAKER_JS = "return window.__speakerObserver ? (window.__activeSpeaker || 'Unknown') : null;"
+
+    def __init__(self, driver, aggregator=None):
         self.driver = driver
-        self.transcript_by_speaker = defaultdict(list)
+        self.aggregator = aggregator or MeetingDataAggregator()
+        # Read-only view; entries are appended by the aggregator thread
+        self.transcript_by_speaker = self.aggregator.transcript_by_speaker
         self.speaker_cache = {}  # Optional: Cache last known speaker name
+        # Kept current by detect_active_speaker_loop; utterances are attributed from it
+        self.recent_speaker = "Unknown"
         self.recognizer = sr.Recognizer()
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 0.8
-        self.should_stop = False
+        self.stop_event = threading.Event()
+        self._asr = None
+        self._vad = webrtcvad.Vad(2) if webrtcvad is not None else None
+
+    def _eval_js(self, script, *args):
+        """Run a script body in the page over CDP, falling back to WebDriver's executeScript"""
+        # Runtime.evaluate skips the W3C element-marshalling pipeline; only local Chrome drivers expose it
+        if hasattr(self.driver, 'execute_cdp_cmd'):
+            expression = f"(function() {{{script}}}).apply(null, {json.dumps(args)})"
+            result = self.driver.execute_cdp_cmd(
+                "Runtime.evaluate", {"expression": expression, "returnByValue": True}
+            )
+            if 'exceptionDetails' not in result:
+                return result['result'].get('value')
+        return self.driver.execute_script(script, *args)
+
     def get_active_speaker_name(self):
         """
         Detects the currently speaking participant on Google Meet using:
@@ -638,27 +1365,11 @@ class AudioTranscriber:
         - full attribute dumps for debug
         """
 
-        def extract_name_from_children(el):
-            """Recursively extract participant name from nested children"""
-            try:
-                children = el.find_elements(By.XPATH, ".//*")
-                for child in children:
-                    name_attrs = [
-                        child.get_attribute("data-self-name"),
-                        child.get_attribute("aria-label"),
-                        child.get_attribute("title"),
-                        child.text
-                    ]
-                    for val in name_attrs:
-                        if val and val.strip() and 2 < len(val.strip()) < 50:
-                            print(f"   🔍 Found child name: {val.strip()}")
-                            return val.strip()
-            except Exception as e:
-                print(f"⚠️ Error in child name lookup: {e}")
-            return None
-
+        # Seeds the speaker observer and backs it up; diagnostics go to DEBUG, and the
+        # attribute dumps are neither collected in-page nor logged unless DEBUG is enabled
+        debug = _LOG.isEnabledFor(logging.DEBUG)
         try:
-            print("\n🔍 Scanning Google Meet UI for active speaker...")
+            _LOG.debug("🔍 Scanning Google Meet UI for active speaker...")
 
             # 🧠 Strategy 1: Look for aria-labels saying someone "is speaking"
             try:
@@ -667,309 +1378,544 @@ class AudioTranscriber:
                     label = el.get_attribute("aria-label")
                     if label and "is speaking" in label:
                         name = label.replace(" is speaking", "").strip()
-                        print(f"✅ Found speaker via aria-label: {name}")
+                        _LOG.debug("✅ Found speaker via aria-label: %s", name)
                         return name
             except Exception as e:
-                print(f"⚠️ aria-label strategy failed: {e}")
+                _LOG.debug("⚠️ aria-label strategy failed: %s", e)
 
-            # 🎯 Strategy 2: Inspect tiles using class clues and attributes
-            tiles = self.driver.find_elements(By.CSS_SELECTOR, "div[jsname][class*='Kqi1ib'], div[class*='Kqi1ib']")
-            print(f"🧱 Found {len(tiles)} possible speaker tiles")
+            # 🎯 Strategy 2: Inspect tiles using class clues and attributes (one round trip for all tiles)
+            tiles = self._eval_js(self._TILE_DUMP_JS, self.SPEAKER_TILE_CSS, debug) or []
+            _LOG.debug("🧱 Found %s possible speaker tiles", len(tiles))
 
             for i, tile in enumerate(tiles):
-                try:
-                    print(f"\n🔎 Tile {i + 1}")
-                    # Print direct attributes
-                    tile_attrs = self.driver.execute_script("""
-                        var element = arguments[0];
-                        var attrs = {};
-                        for (var i = 0; i < element.attributes.length; i++) {
-                            var attr = element.attributes[i];
-                            attrs[attr.name] = attr.value;
-                        }
-                        return attrs;
-                    """, tile)
-
-                    for attr_name, attr_value in tile_attrs.items():
-                        print(f"   🏷️ {attr_name}: {attr_value}")
-
-                    class_name = tile.get_attribute("class") or ""
-                    style = tile.get_attribute("style") or ""
-
-                    # Heuristic indicators of active speaker
-                    if "border" in class_name or "pulse" in class_name or "scale" in style or "z-index" in style:
-                        print("   💡 Possible visual cue of speaking")
-                        nested_name = extract_name_from_children(tile)
-                        if nested_name:
-                            print(f"✅ Active speaker via tile visual + nested: {nested_name}")
-                            return nested_name
-
-                    # Fallback: check top-level text or attribute
-                    raw_name = tile.get_attribute("data-self-name") or tile.get_attribute("aria-label") or tile.text
-                    if raw_name and raw_name.strip():
-                        print(f"🛟 Fallback tile name: {raw_name.strip()}")
-                        return raw_name.strip()
-
-                except Exception as tile_err:
-                    print(f"⚠️ Error in tile {i + 1}: {tile_err}")
+                _LOG.debug("🔎 Tile %s", i + 1)
+                if debug:
+                    for attr_name, attr_value in tile['attrs'].items():
+                        _LOG.debug("   🏷️ %s: %s", attr_name, attr_value)
+
+                # Heuristic indicators of active speaker
+                if tile['cue']:
+                    _LOG.debug("   💡 Possible visual cue of speaking")
+                    if tile['nested']:
+                        _LOG.debug("   🔍 Found child name: %s", tile['nested'])
+                        _LOG.debug("✅ Active speaker via tile visual + nested: %s", tile['nested'])
+                        return tile['nested']
+
+                # Fallback: check top-level text or attribute
+                if tile['raw']:
+                    _LOG.debug("🛟 Fallback tile name: %s", tile['raw'])
+                    return tile['raw']
 
             # 🚑 Strategy 3: Global fallback scan of named divs
-            fallback_elements = self.driver.find_elements(By.CSS_SELECTOR, "div[data-self-name], div[aria-label], div[title]")
-            print(f"\n🔍 Running fallback scan for names from {fallback_elements} elements")
-            for el in fallback_elements:
-                try:
-                
-                    try:
-                        print(f"\n🔎 Globle fallback {i + 1}")
-                        # Print direct attributes
-                        tile_attrs = self.driver.execute_script("""
-                            var element = arguments[0];
-                            var attrs = {};
-                            for (var i = 0; i < element.attributes.length; i++) {
-                                var attr = element.attributes[i];
-                                attrs[attr.name] = attr.value;
-                            }
-                            return attrs;
-                        """, el)
-
-                        for attr_name, attr_value in tile_attrs.items():
-                            print(f"   🏷️ {attr_name}: {attr_value}")
-
-                        class_name = el.get_attribute("class") or ""
-                        style = el.get_attribute("style") or ""
-
-                        # Heuristic indicators of active speaker
-                        if "border" in class_name or "pulse" in class_name or "scale" in style or "z-index" in style:
-                            print("   💡 Possible visual cue of speaking")
-                            nested_name = extract_name_from_children(tile)
-                            if nested_name:
-                                print(f"✅ Active speaker via tile visual + nested: {nested_name}")
-                                return nested_name
-
-                        # Fallback: check top-level text or attribute
-                        raw_name = tile.get_attribute("data-self-name") or tile.get_attribute("aria-label") or tile.text
-                        if raw_name and raw_name.strip():
-                            print(f"🛟 Fallback tile name: {raw_name.strip()}")
-                            return raw_name.strip()
-
-                    except Exception as tile_err:
-                        print(f"⚠️ Error in tile {i + 1}: {tile_err}")
-
-                    name = el.get_attribute("data-self-name") or el.get_attribute("aria-label") or el.get_attribute("title") or el.text
-                    if name and name.strip():
-                        print(f"🛟 Fallback match: {name.strip()}")
-                        return name.strip()
-                except:
-                    continue
-
-            print("❌ No speaker name determined using all methods.")
+            if not debug:
+                name = self._eval_js(self._FIRST_NAME_JS, self.NAMED_ELEMENT_CSS)
+                if name:
+                    return name
+                return "Unknown"
+
+            fallback_elements = self._eval_js(self._TILE_DUMP_JS, self.NAMED_ELEMENT_CSS, debug) or []
+            _LOG.debug("🔍 Running fallback scan for names from %s elements", len(fallback_elements))
+            for i, el in enumerate(fallback_elements):
+                _LOG.debug("🔎 Globle fallback %s", i + 1)
+                for attr_name, attr_value in el['attrs'].items():
+                    _LOG.debug("   🏷️ %s: %s", attr_name, attr_value)
+
+                if el['name']:
+                    _LOG.debug("🛟 Fallback match: %s", el['name'])
+                    return el['name']
+
+            _LOG.debug("❌ No speaker name determined using all methods.")
             return "Unknown"
 
         except Exception as outer_e:
-            print(f"❌ Fatal error in get_active_speaker_name: {outer_e}")
+            _LOG.warning("❌ Fatal error in get_active_speaker_name: %s", outer_e)
             return "Unknown"
 
     def capture_transcript(self):
         Logger.print_status("🎙️ Starting transcript capture...")
 
-        while not self.should_stop:
-            with sr.Microphone() as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                try:
-                    audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=10)
-                    text = self.recognizer.recognize_google(audio)
-                    timestamp = datetime.now().strftime('%H:%M:%S')
+        if WhisperModel is not None and sd is not None:
+            self._capture_transcript_local()
+        elif gcloud_speech is not None and os.environ.get('GOOGLE_APPLICATION_CREDENTIALS'):
+            self._capture_transcript_cloud()
+        else:
+            self._capture_transcript_google()
 
-                    # 🧠 Assign speaker name from UI
-                    speaker_name = self.get_active_speaker_name()  # Or pull from another bot class if shared
+    def _commit_transcript(self, text):
+        """Attribute a finished utterance to the active speaker and store it"""
+        timestamp = datetime.now().strftime('%H:%M:%S')
 
-                    self.transcript_by_speaker[speaker_name].append({
-                        "timestamp": timestamp,
-                        "text": text
-                    })
+        # 🧠 Attribute to the speaker the page observer last reported
+        speaker_name = self.recent_speaker
 
-                    Logger.print_status(f"[{timestamp}] {speaker_name}: {text}")
+        self.aggregator.transcript_q.put((speaker_name, timestamp, text))
+
+        Logger.print_status(f"[{timestamp}] {speaker_name}: {text}")
+
+    def _has_speech(self, samples):
+        """Check 30ms frames with WebRTC VAD; assume speech when VAD is unavailable"""
+        if self._vad is None:
+            return True
+        frame_len = self.SAMPLE_RATE * 30 // 1000
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        n_frames = len(pcm) // frame_len
+        if n_frames == 0:
+            return False
+        voiced = sum(
+            self._vad.is_speech(pcm[i * frame_len:(i + 1) * frame_len].tobytes(), self.SAMPLE_RATE)
+            for i in range(n_frames)
+        )
+        return voiced / n_frames >= self.MIN_SPEECH_RATIO
 
-                except sr.UnknownValueError:
-                    Logger.print_status("Could not understand audio")
-                except sr.WaitTimeoutError:
+    def _capture_transcript_local(self):
+        """Stream microphone audio through a local faster-whisper model (LocalAgreement-2)"""
+        if self._asr is None:
+            try:
+                self._asr = _ensure_asr_model()
+            except Exception as e:
+                # Download or CTranslate2 failure: keep transcribing through the web API instead
+                Logger.print_status(f"Local speech model unavailable, falling back to Google: {e}")
+                self._capture_transcript_google()
+                return
+
+        audio_q = queue.Queue()
+        buffer = AudioRingBuffer(self.BUFFER_SECONDS * self.SAMPLE_RATE)
+        previous_words = []
+
+        def on_audio(indata, frames, time_info, status):
+            audio_q.put(indata[:, 0].copy())
+
+        with sd.InputStream(samplerate=self.SAMPLE_RATE, channels=1, dtype='float32',
+                            blocksize=self.SAMPLE_RATE, callback=on_audio):
+            while not self.stop_event.is_set():
+                try:
+                    chunk = audio_q.get(timeout=1)
+                except queue.Empty:
+                    continue
+
+                buffer.append(chunk)
+                # Catch up on everything that arrived during the last decode so latency can't build up
+                while True:
+                    try:
+                        buffer.append(audio_q.get_nowait())
+                    except queue.Empty:
+                        break
+                if not self._has_speech(buffer.view()):
                     continue
+
+                segments, _ = self._asr.transcribe(buffer.view(), vad_filter=True, beam_size=1, word_timestamps=True)
+                words = [word for segment in segments for word in (segment.words or [])]
+
+                # Commit the prefix that two consecutive hypotheses agree on
+                agreed = 0
+                for current, prev in zip(words, previous_words):
+                    if current.word.strip().lower() != prev.word.strip().lower():
+                        break
+                    agreed += 1
+
+                if agreed:
+                    self._commit_transcript("".join(w.word for w in words[:agreed]).strip())
+                    buffer.consume(int(words[agreed - 1].end * self.SAMPLE_RATE))
+                previous_words = words[agreed:]
+
+    def _capture_transcript_cloud(self):
+        """Stream microphone audio to Google Cloud Speech-to-Text over one bidi gRPC stream"""
+        client = gcloud_speech.SpeechClient()
+        streaming_config = gcloud_speech.StreamingRecognitionConfig(
+            config=gcloud_speech.RecognitionConfig(
+                encoding=gcloud_speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=self.SAMPLE_RATE,
+                language_code="en-US",
+                enable_automatic_punctuation=True,
+            ),
+            interim_results=True,
+        )
+        chunk = self.SAMPLE_RATE // 10  # 100 ms of 16-bit mono audio per request
+
+        while not self.stop_event.is_set():
+            try:
+                with sr.Microphone(sample_rate=self.SAMPLE_RATE, chunk_size=chunk) as source:
+                    def audio_requests():
+                        while not self.stop_event.is_set():
+                            yield gcloud_speech.StreamingRecognizeRequest(audio_content=source.stream.read(chunk))
+
+                    # Audio keeps flowing while results arrive; only final results are committed
+                    for response in client.streaming_recognize(streaming_config, audio_requests()):
+                        for result in response.results:
+                            if result.is_final and result.alternatives:
+                                self._commit_transcript(result.alternatives[0].transcript.strip())
+            except OSError as e:
+                Logger.print_status(f"Microphone error, reopening stream: {e}")
+                self.stop_event.wait(1)
+            except Exception as e:
+                # The API caps a single stream's duration; open a fresh one and carry on
+                Logger.print_status(f"Restarting speech stream: {e}")
+                self.stop_event.wait(1)
+
+    def _capture_transcript_google(self):
+        """Transcribe microphone utterances with the Google Web Speech API"""
+        baseline_threshold = None
+        while not self.stop_event.is_set():
+            try:
+                # Hold one microphone stream for the thread's lifetime; reopen only after a device error
+                with sr.Microphone() as source:
+                    while not self.stop_event.is_set():
+                        # Calibrate once; only redo it if the dynamic threshold drifts far from the baseline
+                        if baseline_threshold is None or \
+                           abs(self.recognizer.energy_threshold - baseline_threshold) / baseline_threshold > self.RECALIBRATE_DRIFT:
+                            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                            baseline_threshold = self.recognizer.energy_threshold
+                        try:
+                            audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=10)
+                            text = self.recognizer.recognize_google(audio)
+                            self._commit_transcript(text)
+
+                        except sr.UnknownValueError:
+                            Logger.print_status("Could not understand audio")
+                        except sr.WaitTimeoutError:
+                            continue
+            except OSError as e:
+                Logger.print_status(f"Microphone error, reopening stream: {e}")
+                self.stop_event.wait(1)
     
     def detect_active_speaker_loop(self):
-        """Continuously check who is the active speaker from the DOM every second"""
-        self.recent_speaker = "Unknown"
-        while not self.should_stop:
-            speaker = self.get_active_speaker_name()
-            if speaker != "Unknown":
-                self.recent_speaker = speaker
-            time.sleep(1)
+        """Track the active speaker from an in-page MutationObserver, read once per second"""
+        # Seed with one full scan; afterwards the observer does the DOM work
+        speaker = self.get_active_speaker_name()
+        if speaker != "Unknown":
+            self.recent_speaker = speaker
+        while not self.stop_event.is_set():
+            try:
+                speaker = self._eval_js(self._READ_SPEAKER_JS)
+                if speaker is None:
+                    self._eval_js(self._SPEAKER_OBSERVER_JS, self.SPEAKER_TILE_CSS)
+                elif speaker != "Unknown":
+                    self.recent_speaker = speaker
+            except Exception as e:
+                Logger.print_status(f"Active speaker read failed: {e}")
+            if self.stop_event.wait(1):
+                break
+
+    def stop(self):
+        """Signal the transcript and speaker threads to exit"""
+        self.stop_event.set()
 
     def get_transcript(self):
+        """Return the collected transcript keyed by speaker"""
+        return dict(self.transcript_by_speaker)
+
+    def print_transcript(self):
+        """Pretty-print the collected transcript to stdout"""
         print("\n📄 Transcript by Speaker:")
-        for speaker, entries in self.transcript_by_speaker.items():
+        for speaker, columns in self.transcript_by_speaker.items():
             print(f"\n🗣️ {speaker}:")
-            for item in entries:
-                print(f"[{item['timestamp']}] {item['text']}")
+            for timestamp, text in zip(columns['timestamps'], columns['texts']):
+                print(f"[{timestamp}] {text}")
 
 
 class EmotionAnalyzer:
-    def __init__(self):
-        self.emotions_by_person = defaultdict(list)
-        self.should_stop = False
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        
+    # Output order of DeepFace's FER emotion model
+    EMOTION_LABELS = ('angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral')
+
+    # YuNet ONNX weights, not shipped with the repo: save face_detection_yunet_2023mar.onnx from
+    # opencv_zoo (models/face_detection_yunet) under this name. Without it the Haar cascade bundled
+    # with opencv-python is used.
+    YUNET_MODEL_PATH = os.path.join(os.path.dirname(__file__), 'models', 'face_detection_yunet.onnx')
+
+    # Max Hamming distance between crop hashes for a face to count as unchanged
+    HASH_DISTANCE = 4
+
+    # Minimum IoU for a detection to continue an existing track
+    IOU_THRESHOLD = 0.3
+    # Sampled frames a track survives without a matching detection
+    TRACK_MAX_AGE = 30
+
+    # Webcam mode requested for analysis; faces stay well above the 48x48 model input
+    CAPTURE_SIZE = (640, 480)
+    CAPTURE_FPS = 5
+    # Open the camera through the native backend rather than letting OpenCV probe for one
+    CAPTURE_BACKEND = cv2.CAP_DSHOW if os.name == 'nt' else cv2.CAP_V4L2
+
+    # int8-quantized export of the emotion model, see export_emotion_onnx()
+    EMOTION_ONNX_PATH = os.path.join(os.path.dirname(__file__), 'models', 'emotion_int8.onnx')
+    ORT_THREADS = 2
+
+    def __init__(self, sample_hz=0.2, batch_frames=1, aggregator=None):
+        self.aggregator = aggregator or MeetingDataAggregator()
+        self.stop_event = threading.Event()
+        # Detector runs once per sample; the default matches the original 5s poll
+        self.sample_interval = 1.0 / sample_hz
+        # Sampled frames that share one model call; each tracked face is classified once per batch,
+        # so batching never adds model work on top of the sample rate
+        self.batch_frames = batch_frames
+        self.face_detector = None
+        if hasattr(cv2, 'FaceDetectorYN') and os.path.exists(self.YUNET_MODEL_PATH):
+            self.face_detector = cv2.FaceDetectorYN.create(self.YUNET_MODEL_PATH, "", (320, 320), score_threshold=0.6)
+            self.face_cascade = None
+        else:
+            self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        self._emo_cache = {}  # face_id -> (dhash, emotion, confidence)
+        self._tracks = {}  # face_id -> (x, y, w, h, last_seen_frame)
+        self._next_track_id = 0
+        self._frame_index = 0
+        self._emo_sess = None
+        if ort is not None and os.path.exists(self.EMOTION_ONNX_PATH):
+            options = ort.SessionOptions()
+            # Two intra-op threads leave cores for the transcriber and the browser
+            options.intra_op_num_threads = self.ORT_THREADS
+            options.inter_op_num_threads = 1
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._emo_sess = ort.InferenceSession(
+                self.EMOTION_ONNX_PATH, sess_options=options, providers=["CPUExecutionProvider"]
+            )
+            self._emo_input = self._emo_sess.get_inputs()[0].name
+
+    @classmethod
+    def export_emotion_onnx(cls, path=None):
+        """One-time export of the DeepFace emotion model to an int8 ONNX file"""
+        import tf2onnx
+        from deepface import DeepFace
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        path = path or cls.EMOTION_ONNX_PATH
+        model = DeepFace.build_model("Emotion")
+        fp32_path = os.path.splitext(path)[0] + "_fp32.onnx"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tf2onnx.convert.from_keras(getattr(model, 'model', model), output_path=fp32_path)
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+        return path
+
+    def _detect_faces(self, frame):
+        """Return face boxes as (x, y, w, h) tuples"""
+        if self.face_detector is not None:
+            frame_h, frame_w = frame.shape[:2]
+            self.face_detector.setInputSize((frame_w, frame_h))
+            _, faces = self.face_detector.detect(frame)
+            if faces is None:
+                return []
+            return [tuple(max(int(v), 0) for v in row[:4]) for row in faces]
+
+        # Cascade fallback: detect on a half-size grayscale copy, then map boxes back to the full frame
+        small = cv2.resize(frame, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        # minSize bounds the pyramid: 30px here is 60px in the full frame
+        faces = self.face_cascade.detectMultiScale(
+            gray, scaleFactor=1.2, minNeighbors=4, minSize=(30, 30), flags=cv2.CASCADE_SCALE_IMAGE
+        )
+        return [tuple(int(v) * 2 for v in face) for face in faces]
+
+    @classmethod
+    def _get_emotion_model(cls):
+        """DeepFace emotion model shared by every analyzer in the process"""
+        return _ensure_model("Emotion")
+
+    @classmethod
+    def warmup(cls):
+        """Build the model and run one dummy prediction to pay TF's first-call cost up front"""
+        try:
+            if ort is not None and os.path.exists(cls.EMOTION_ONNX_PATH):
+                return
+            cls._get_emotion_model().predict(np.zeros((1, 48, 48, 1), np.float32), verbose=0)
+            Logger.print_status("Emotion model warmed up")
+        except Exception as e:
+            Logger.print_status(f"Emotion model warmup failed: {e}")
+
+    def _predict_emotions(self, face_imgs):
+        """Run a single batched forward pass over all face crops of a frame"""
+        if not face_imgs:
+            return []
+        batch = np.stack([
+            cv2.resize(cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY), (48, 48))
+            for face_img in face_imgs
+        ]).astype(np.float32)[..., np.newaxis] / 255.0
+        if self._emo_sess is not None:
+            probs = self._emo_sess.run(None, {self._emo_input: batch})[0]
+        else:
+            probs = self._get_emotion_model().predict(batch, batch_size=len(batch), verbose=0)
+        results = []
+        for row in probs:
+            idx = int(np.argmax(row))
+            results.append((self.EMOTION_LABELS[idx], float(100 * row[idx] / row.sum())))
+        return results
+
+    @staticmethod
+    def _iou_matrix(boxes_a, boxes_b):
+        """Pairwise IoU between two (N, 4) arrays of x, y, w, h boxes"""
+        a = boxes_a[:, None, :]
+        b = boxes_b[None, :, :]
+        inter_w = np.clip(np.minimum(a[..., 0] + a[..., 2], b[..., 0] + b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+        inter_h = np.clip(np.minimum(a[..., 1] + a[..., 3], b[..., 1] + b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+        inter = inter_w * inter_h
+        union = a[..., 2] * a[..., 3] + b[..., 2] * b[..., 3] - inter
+        return inter / np.maximum(union, 1e-6)
+
+    def _assign_face_ids(self, faces):
+        """Greedily match detections to existing tracks so face ids stay stable across frames"""
+        self._frame_index += 1
+        boxes = np.asarray(faces, dtype=np.float32).reshape(-1, 4)
+        face_ids = [None] * len(boxes)
+
+        track_ids = list(self._tracks)
+        if track_ids and len(boxes):
+            track_boxes = np.array([self._tracks[t][:4] for t in track_ids], dtype=np.float32)
+            iou = self._iou_matrix(boxes, track_boxes)
+            matched_tracks = set()
+            for flat_idx in np.argsort(iou, axis=None)[::-1]:
+                det, trk = np.unravel_index(flat_idx, iou.shape)
+                if iou[det, trk] <= self.IOU_THRESHOLD:
+                    break
+                if face_ids[det] is None and trk not in matched_tracks:
+                    face_ids[det] = track_ids[trk]
+                    matched_tracks.add(trk)
+
+        for det, box in enumerate(boxes):
+            if face_ids[det] is None:
+                self._next_track_id += 1
+                face_ids[det] = f"person_{self._next_track_id}"
+            self._tracks[face_ids[det]] = (*(int(v) for v in box), self._frame_index)
+
+        for face_id, track in list(self._tracks.items()):
+            if self._frame_index - track[4] > self.TRACK_MAX_AGE:
+                del self._tracks[face_id]
+                self._emo_cache.pop(face_id, None)
+
+        return face_ids
+
+    @staticmethod
+    def _dhash(face_img):
+        """64-bit difference hash of a face crop"""
+        small = cv2.resize(cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY), (9, 8))
+        bits = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+    def _classify_faces(self, face_ids, face_imgs):
+        """Reuse cached labels for faces whose crop is unchanged, predict the rest"""
+        hashes = [self._dhash(face_img) for face_img in face_imgs]
+        results = [None] * len(face_imgs)
+        misses = []
+        for i, (face_id, face_hash) in enumerate(zip(face_ids, hashes)):
+            cached = self._emo_cache.get(face_id)
+            if cached and (cached[0] ^ face_hash).bit_count() < self.HASH_DISTANCE:
+                results[i] = cached[1:]
+            else:
+                misses.append(i)
+
+        predictions = self._predict_emotions([face_imgs[i] for i in misses])
+        for i, prediction in zip(misses, predictions):
+            self._emo_cache[face_ids[i]] = (hashes[i], *prediction)
+            results[i] = prediction
+        return results
+
     def analyze_emotions(self):
         """Analyze participant emotions via webcam"""
         Logger.print_status("Starting emotion analysis thread")
-        cap = cv2.VideoCapture(0)
+        if self._emo_sess is None:
+            self._get_emotion_model()
+        cap = cv2.VideoCapture(0, self.CAPTURE_BACKEND)
+        # Keep the driver queue short so a retrieved frame is never stale
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        # Small MJPG frames at a low rate: detection cost scales with pixels, and we sample ~1 Hz
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.CAPTURE_SIZE[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.CAPTURE_SIZE[1])
+        cap.set(cv2.CAP_PROP_FPS, self.CAPTURE_FPS)
+        next_sample = time.monotonic()
+        pending = []  # (face_id, timestamp, crop) awaiting the next batched prediction
+        pending_frames = 0
         
-        while not self.should_stop:
-            ret, frame = cap.read()
+        while not self.stop_event.is_set():
+            # grab() drains frames without decoding; only decode when a sample is due
+            if not cap.grab():
+                # No camera or a dropped device: back off instead of spinning on a failing grab()
+                self.stop_event.wait(1)
+                continue
+            if time.monotonic() < next_sample:
+                continue
+            next_sample = time.monotonic() + self.sample_interval
+
+            ret, frame = cap.retrieve()
             if not ret:
                 continue
                 
             try:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
-                
-                for i, (x, y, w, h) in enumerate(faces):
-                    face_img = frame[y:y+h, x:x+w]
-                    
-                    try:
-                        face_id = f"person_{i+1}"
-                        analysis = DeepFace.analyze(face_img, actions=['emotion'], enforce_detection=False)
-                        dominant_emotion = analysis[0]['dominant_emotion']
-                        timestamp = datetime.now().strftime('%H:%M:%S')
-                        
-                        self.emotions_by_person[face_id].append({
-                            'timestamp': timestamp,
-                            'emotion': dominant_emotion,
-                            'confidence': analysis[0]['emotion'][dominant_emotion]
-                        })
-                        
-                        Logger.print_status(f"{face_id}: {dominant_emotion} ({analysis[0]['emotion'][dominant_emotion]:.1f}%)")
-                        
-                    except Exception as e:
-                        Logger.print_status(f"Emotion analysis error: {e}")
-                        
+                faces = self._detect_faces(frame)
+                face_ids = self._assign_face_ids(faces)
+                timestamp = time.time()
+                pending.extend(
+                    (face_id, timestamp, frame[y:y+h, x:x+w])
+                    for face_id, (x, y, w, h) in zip(face_ids, faces)
+                )
             except Exception as e:
                 Logger.print_status(f"Face detection error: {e}")
-                
-            time.sleep(5)
+
+            pending_frames += 1
+            if pending_frames < self.batch_frames:
+                continue
+            batch, pending, pending_frames = pending, [], 0
+
+            try:
+                # One crop per tracked face: its latest crop stands for all of its samples in the batch
+                latest = {face_id: crop for face_id, _, crop in batch}
+                face_ids = list(latest)
+                predictions = dict(zip(face_ids, self._classify_faces(face_ids, [latest[f] for f in face_ids])))
+
+                for face_id, timestamp, _ in batch:
+                    dominant_emotion, confidence = predictions[face_id]
+                    self.aggregator.emotion_q.put((face_id, timestamp, dominant_emotion, confidence))
+
+                    Logger.print_status(f"{face_id}: {dominant_emotion} ({confidence:.1f}%)")
+
+            except Exception as e:
+                Logger.print_status(f"Emotion analysis error: {e}")
             
         cap.release()
         Logger.print_status("Emotion analysis stopped")
 
+    def stop(self):
+        """Signal the emotion analysis thread to exit"""
+        self.stop_event.set()
+
     def get_emotion_data(self):
         """Get the current emotion data"""
-        return dict(self.emotions_by_person)
-
-class MeetingReporter:
-    @staticmethod
-    def generate_report(filename, transcript_data, emotion_data, meeting_link):
-        """Generate comprehensive meeting report"""
-        Logger.print_status("Generating meeting report...")
-        
-        # Generate visualizations
-        speaker_chart, emotion_chart = MeetingReporter._generate_visualizations(transcript_data, emotion_data)
-        
-        report_data = {
-            'meeting_title': os.path.splitext(os.path.basename(filename))[0],
-            'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'duration': MeetingReporter._get_recording_duration(),
-            'transcript_by_speaker': transcript_data,
-            'emotions_by_person': emotion_data,
-            'meeting_link': meeting_link,
-            'speaker_chart': speaker_chart,
-            'emotion_chart': emotion_chart
-        }
-        
-        # Save report to JSON file
-        report_filename = os.path.splitext(filename)[0] + "_report.json"
-        with open(report_filename, 'w') as f:
-            json.dump(report_data, f, indent=2)
-            Logger.print_status(f"Saved report to {report_filename}")
-            
-        return report_filename
-
-    @staticmethod
-    def _generate_visualizations(transcript_data, emotion_data):
-        """Generate charts for speaker and emotion data"""
-        Logger.print_status("Generating data visualizations...")
-        
-        # Speaker distribution chart
-        speaker_chart = None
-        if transcript_data:
-            speaker_counts = {speaker: len(entries) for speaker, entries in transcript_data.items()}
-            plt.figure(figsize=(8, 6))
-            plt.pie(speaker_counts.values(), labels=speaker_counts.keys(), autopct='%1.1f%%')
-            plt.title('Speaker Contribution')
-            speaker_buf = BytesIO()
-            plt.savefig(speaker_buf, format='png')
-            plt.close()
-            speaker_buf.seek(0)
-            speaker_chart = base64.b64encode(speaker_buf.read()).decode('utf-8')
-            Logger.print_status("Generated speaker distribution chart")
-        
-        # Emotion distribution chart
-        emotion_chart = None
-        if emotion_data:
-            emotion_counts = defaultdict(int)
-            for person_emotions in emotion_data.values():
-                for entry in person_emotions:
-                    emotion_counts[entry['emotion']] += 1
-            
-            plt.figure(figsize=(8, 6))
-            plt.pie(emotion_counts.values(), labels=emotion_counts.keys(), autopct='%1.1f%%')
-            plt.title('Emotion Distribution')
-            emotion_buf = BytesIO()
-            plt.savefig(emotion_buf, format='png')
-            plt.close()
-            emotion_buf.seek(0)
-            emotion_chart = base64.b64encode(emotion_buf.read()).decode('utf-8')
-            Logger.print_status("Generated emotion distribution chart")
-        
-        return speaker_chart, emotion_chart
-
-    @staticmethod
-    def _get_recording_duration(start_time, end_time):
-        """Calculate recording duration in HH:MM:SS format
-        
-        Args:
-            start_time (datetime): When the meeting was joined
-            end_time (datetime): When the meeting was stopped
-            
-        Returns:
-            str: Duration in HH:MM:SS format
-        """
-        if not start_time or not end_time:
-            return "00:00:00"
-        
-        duration = end_time - start_time
-        total_seconds = int(duration.total_seconds())
-        
-        # Calculate hours, minutes, seconds
-        hours = total_seconds // 3600
-        remaining_seconds = total_seconds % 3600
-        minutes = remaining_seconds // 60
-        seconds = remaining_seconds % 60
-        
-        # Format as HH:MM:SS with leading zeros
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        return self.aggregator.get_emotions_by_person()
 
 class MeetBot:
     """Main Google Meet bot class that coordinates all components"""
+    # Longest wait for the TS -> MP4 remux before the report falls back to the TS
+    REMUX_TIMEOUT = 120
     
     def __init__(self, email, password, meeting_link, filename, duration, headless=False):
         self.email = email
         self.password = password
         self.meeting_link = meeting_link
         self.filename = filename
+        self._path = pathlib.Path(filename)
         self.duration = duration
         self.headless = headless
+        # Build the emotion model while the browser starts and joins the meeting
+        self._warmup_thread = threading.Thread(
+            target=EmotionAnalyzer.warmup,
+            daemon=True,
+            name="EmotionWarmupThread"
+        )
+        self._warmup_thread.start()
+        # Probe audio devices off the critical path; start_recording reads the cached result
+        self._device_probe_thread = threading.Thread(
+            target=MeetingRecorder._get_audio_devices,
+            daemon=True,
+            name="AudioDeviceProbeThread"
+        )
+        self._device_probe_thread.start()
         # Timing attributes
         self.meeting_start_time = None
         self.meeting_end_time = None
+        # Monotonic counterparts used for duration math (immune to clock jumps)
+        self._meeting_start_mono = None
+        self._meeting_end_mono = None
+        # Set once monitoring finishes normally; stop() then writes the report
+        self._report_pending = False
+        self._recording_path = None
         
         # Initialize components
         self.driver_manager = WebDriverManager(headless)
@@ -980,6 +1926,7 @@ class MeetBot:
         self.monitor = None
         self.transcriber = None
         self.emotion_analyzer = None
+        self.aggregator = None
         
         # Threads
         self.transcript_thread = None
@@ -1010,7 +1957,8 @@ class MeetBot:
             if joined:
                 self.participant_analyzer = ParticipantAnalyzer(driver)
                 
-                # Start recording immediately
+                # Start recording immediately; the device probe ran while we logged in and joined
+                self._device_probe_thread.join()
                 self.recorder = MeetingRecorder(self.filename, self.duration)
                 self.recorder.start_recording()
                 
@@ -1022,15 +1970,15 @@ class MeetBot:
 
                     # Record meeting start time    
                     self.meeting_start_time = datetime.now()
+                    self._meeting_start_mono = time.monotonic()
                         
                     # Start monitoring
                     self.monitor = MeetingMonitor(driver, self.recorder, self.participant_analyzer, self.duration)
                     Logger.print_status("Starting meeting monitoring...")
                     self.monitor.monitor()
                     
-                    # Generate report if completed successfully
-                    self._generate_final_report()
-                    Logger.print_status("Meeting recording completed successfully")
+                    # Report once stop() has finalized the recording and flushed every thread
+                    self._report_pending = True
                     
                 except Exception as e:
                     Logger.print_status(f"Error in bot execution: {str(e)}")
@@ -1045,8 +1993,10 @@ class MeetBot:
 
     def _start_background_services(self, driver):
         """Start all background services in separate threads"""
-        self.transcriber = AudioTranscriber(driver)
-        self.emotion_analyzer = EmotionAnalyzer()
+        self.aggregator = MeetingDataAggregator()
+        self.transcriber = AudioTranscriber(driver, aggregator=self.aggregator)
+        # Sample the webcam every second but run the model once per 5 frames
+        self.emotion_analyzer = EmotionAnalyzer(aggregator=self.aggregator)
         
         self.transcript_thread = threading.Thread(
             target=self.transcriber.capture_transcript, 
@@ -1080,27 +2030,30 @@ class MeetBot:
             transcript_data = self.transcriber.get_transcript() if self.transcriber else {}
             emotion_data = self.emotion_analyzer.get_emotion_data() if self.emotion_analyzer else {}
             
+            # Texts are already contiguous per speaker; summary and visualizations share the results
+            all_text = " ".join(text for columns in transcript_data.values() for text in columns['texts'])
+            speaker_counts = {speaker: len(columns['texts']) for speaker, columns in transcript_data.items()}
+            
             # Create report structure
             report = {
                 "meeting_details": {
-                    "title": os.path.splitext(os.path.basename(self.filename))[0],
+                    "title": self._path.stem,
                     "link": self.meeting_link,
-                    "duration": self._get_recording_duration(),
+                    "duration": format_duration(self._recording_seconds()),
                     "start_time": self.meeting_start_time.isoformat() if self.meeting_start_time else None,
                     "end_time": self.meeting_end_time.isoformat() if self.meeting_end_time else None,
-                    "participant_count": len(self.participant_analyzer.get_participant_data()) if self.participant_analyzer else 0,
-                    "recording_path": os.path.abspath(self.filename)
+                    "participant_count": self.participant_analyzer.get_participant_count() if self.participant_analyzer else 0,
+                    "recording_path": self._recording_path
                 },
                 "transcript": transcript_data,
                 "emotion_analysis": emotion_data,
-                "summary": self._generate_summary(transcript_data),
-                "visualizations": self._generate_visualizations(transcript_data, emotion_data)
+                "summary": self._generate_summary(all_text),
+                "visualizations": self._generate_visualizations(speaker_counts, emotion_data)
             }
             
             # Save report to file
-            report_filename = f"report_{os.path.splitext(self.filename)[0]}.json"
-            with open(report_filename, 'w') as f:
-                json.dump(report, f, indent=2)
+            report_filename = self._path.with_name(self._path.stem + "_report.json")
+            write_json_report(report_filename, report)
                 
             Logger.print_status(f"✅ Report generated successfully: {report_filename}")
             return report
@@ -1109,7 +2062,7 @@ class MeetBot:
             Logger.print_status(f"❌ Error generating report: {str(e)}")
             return None
 
-    def _generate_summary(self, transcript_data):
+    def _generate_summary(self, all_text):
         """Generate a summary of the meeting"""
         summary = {
             "key_topics": [],
@@ -1118,48 +2071,33 @@ class MeetBot:
         }
         
         try:
-            if transcript_data:
-                # Extract all text from transcript
-                all_text = " ".join(
-                    entry['text'] 
-                    for speaker in transcript_data.values() 
-                    for entry in speaker
-                )
-                
+            if all_text:
                 # Simple keyword extraction (in real implementation use NLP)
-                action_words = ['action', 'todo', 'task', 'follow up', 'next steps']
-                summary['action_items'] = [
-                    sentence.strip() 
-                    for sentence in all_text.split('.') 
-                    if any(word in sentence.lower() for word in action_words)
-                ]
+                summary['action_items'] = [sentence.strip() for sentence in _ACTION_ITEM_RE.findall(all_text)]
                 
                 # Get most frequent words as key topics
-                from collections import Counter
-                words = [word.lower() for word in all_text.split() if len(word) > 4]
-                summary['key_topics'] = [word for word, count in Counter(words).most_common(5)]
+                counts = Counter(
+                    word for word in _TOPIC_WORD_RE.findall(all_text.lower()) if word not in _TOPIC_STOPWORDS
+                )
+                summary['key_topics'] = [word for word, _ in counts.most_common(5)]
                 
         except Exception as e:
             Logger.print_status(f"⚠️ Error generating summary: {str(e)}")
             
         return summary
 
-    def _generate_visualizations(self, transcript_data, emotion_data):
-        """Generate visualization data for the report"""
+    def _generate_visualizations(self, speaker_counts, emotion_data):
+        """Generate raw distribution counts for the report; charts are drawn client-side"""
         visualizations = {}
         
         try:
-            if transcript_data:
+            if speaker_counts:
                 # Speaker distribution chart
-                speaker_counts = {speaker: len(entries) for speaker, entries in transcript_data.items()}
-                visualizations['speaker_distribution'] = speaker_counts
+                visualizations['speaker_distribution'] = dict(speaker_counts)
                 
             if emotion_data:
-                # Emotion distribution
-                emotion_counts = defaultdict(int)
-                for person_emotions in emotion_data.values():
-                    for entry in person_emotions:
-                        emotion_counts[entry['emotion']] += 1
+                # Emotion distribution, counted from the same snapshot as the rest of the report
+                emotion_counts = Counter(e['emotion'] for lst in emotion_data.values() for e in lst)
                 visualizations['emotion_distribution'] = dict(emotion_counts)
                 
         except Exception as e:
@@ -1167,20 +2105,13 @@ class MeetBot:
             
         return visualizations
 
-    def _get_recording_duration(self):
-        """Calculate actual recording duration"""
-        if not self.meeting_start_time or not self.meeting_end_time:
-            return "00:00:00"
-        
-        duration = self.meeting_end_time - self.meeting_start_time
-        total_seconds = int(duration.total_seconds())
+    def _recording_seconds(self):
+        """Seconds recorded so far (up to the end time once the meeting has stopped)"""
+        if self._meeting_start_mono is None:
+            return 0
         
-        hours = total_seconds // 3600
-        remaining_seconds = total_seconds % 3600
-        minutes = remaining_seconds // 60
-        seconds = remaining_seconds % 60
-        
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        end = self._meeting_end_mono if self._meeting_end_mono is not None else time.monotonic()
+        return end - self._meeting_start_mono
 
     def stop(self):
         """Cleanup all resources and stop all components"""
@@ -1188,26 +2119,45 @@ class MeetBot:
         
         # Record end time
         self.meeting_end_time = datetime.now()
+        self._meeting_end_mono = time.monotonic()
         
         # Stop monitoring if active
         if self.monitor:
-            self.monitor.should_stop = True
+            self.monitor.stop()
+        if self.participant_analyzer:
+            self.participant_analyzer.stop()
             
+        # Signal background services first so they wind down while FFmpeg finalizes
+        if self.transcriber:
+            self.transcriber.stop()
+        if self.emotion_analyzer:
+            self.emotion_analyzer.stop()
+
         # Stop recording if active
         if self.recorder:
             self.recorder.stop_recording()
-        
-        # Stop background services
-        if self.transcriber:
-            self.transcriber.should_stop = True
-        if self.emotion_analyzer:
-            self.emotion_analyzer.should_stop = True
             
-        # Wait for threads to finish
-        if self.transcript_thread and self.transcript_thread.is_alive():
-            self.transcript_thread.join(timeout=5)
-        if self.emotion_thread and self.emotion_thread.is_alive():
-            self.emotion_thread.join(timeout=5)
+        # Wait for threads to finish, joining them concurrently
+        threads = [
+            t for t in (self.transcript_thread, self.emotion_thread, self.active_user_thread)
+            if t and t.is_alive()
+        ]
+        if threads:
+            with ThreadPoolExecutor(max_workers=len(threads)) as executor:
+                for future in as_completed([executor.submit(t.join, 5) for t in threads]):
+                    future.result()
+        if self.aggregator:
+            self.aggregator.stop()
+
+        # The remux must finish before the report can point at the MP4
+        if self.recorder:
+            self._recording_path = self.recorder.wait_for_recording(timeout=self.REMUX_TIMEOUT)
+
+        # Generate report if completed successfully
+        if self._report_pending:
+            self._report_pending = False
+            self._generate_final_report()
+            Logger.print_status("Meeting recording completed successfully")
         
         # Quit driver
         if self.driver_manager:
@@ -1215,6 +2165,6 @@ class MeetBot:
         
         # Print final duration
         if self.meeting_start_time and self.meeting_end_time:
-            Logger.print_status(f"⏱️ Total meeting duration: {self._get_recording_duration()}")
+            Logger.print_status(f"⏱️ Total meeting duration: {format_duration(self._recording_seconds())}")
         
         Logger.print_status("✅ MeetBot stopped successfully")
\ No newline at end of file
@@ -82,6 +82,10 @@ EMAIL_USE_TLS = True
 # Google Meet Bot Credentials
 MEET_BOT_EMAIL = os.environ.get('MEET_BOT_EMAIL')
 MEET_BOT_PASSWORD = os.environ.get('MEET_BOT_PASSWORD')
+# Optional shared Selenium Grid (e.g. http://localhost:4444); unset launches a local ChromeDriver.
+# The node must run on this machine: recording, transcription and emotion analysis capture the
+# local screen, microphone and webcam, not the node's.
+SELENIUM_GRID_URL = os.environ.get('SELENIUM_GRID_URL')
 
 # Recording settings
 RECORDINGS_DIR = "/tmp/recordings"
@@ -224,16 +228,31 @@ SIMPLE_JWT = {
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'bot_status': {
+            'format': '[%(asctime)s] [BOT STATUS] %(message)s',
+            'datefmt': '%Y-%m-%d %H:%M:%S',
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
         },
+        'bot_console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'bot_status',
+        },
     },
     'loggers': {
         'django.db.backends': {
             'handlers': ['console'],
             'level': 'DEBUG',  # Change to INFO in prod
         },
+        'bot.tasks': {
+            'handlers': ['bot_console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     }
 }
 